@@ -0,0 +1,55 @@
+"""Times MatchStats/PlayerMatchStats construction on a large synthetic overtime match.
+
+Compares the single-pass kill grouping against the old per-round scan of
+data["kills"] (O(rounds x kills)).
+
+    python bench/bench_matchstats.py [rounds] [repeat]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import ValFunc as vf
+from synthetic import make_match
+
+
+def legacy_group_kills(data, curTeam):
+    '''The pre-index parse: one full scan of data["kills"] per round'''
+    rounds = []
+    for i in range(data["metadata"]["rounds_played"]):
+        round_kills = []
+        for kill in data["kills"]:
+            if kill["round"] == i:
+                teamLeft = 0
+                enemLeft = 0
+                playerList = []
+                for playerLocation in kill["player_locations_on_kill"]:
+                    if playerLocation["player_team"] == curTeam:
+                        teamLeft += 1
+                    else:
+                        enemLeft += 1
+                    playerList.append(playerLocation["player_puuid"])
+                round_kills.append((kill["kill_time_in_round"], kill["kill_time_in_match"], kill["killer_puuid"],
+                                    kill["killer_team"], kill["victim_puuid"], kill["victim_team"],
+                                    teamLeft, enemLeft, playerList))
+        rounds.append(round_kills)
+    return rounds
+
+
+def main(rounds=60, repeat=20):
+    data = make_match(rounds, seed=7)
+    puuid = data["players"]["all_players"][0]["puuid"]
+    print(f'{rounds} rounds, {len(data["kills"])} kills, best of {repeat}')
+    legacy = min(timeit.repeat(lambda: legacy_group_kills(data, 'Red'), number=1, repeat=repeat))
+    grouped = min(timeit.repeat(lambda: vf.group_kills_by_round(data, 'Red'), number=1, repeat=repeat))
+    match = min(timeit.repeat(lambda: vf.MatchStats(data, 'Red'), number=1, repeat=repeat))
+    player = min(timeit.repeat(lambda: vf.PlayerMatchStats(None, puuid, data), number=1, repeat=repeat))
+    print(f'  kill grouping, per-round scan: {legacy * 1e3:8.3f} ms')
+    print(f'  kill grouping, single pass:    {grouped * 1e3:8.3f} ms ({legacy / grouped:.1f}x)')
+    print(f'  MatchStats:                    {match * 1e3:8.3f} ms')
+    print(f'  PlayerMatchStats:              {player * 1e3:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,52 @@
+"""Recorded API responses used by the benchmarks and the local stub server.
+
+Each fixture is the gzipped JSON body of one response, named by kind:
+
+    match_<match id>.json.gz      /v2/match/<match id>
+    account_<puuid>.json.gz       /v1/account/... and /v1/by-puuid/account/...
+    mmr_<puuid>.json.gz           /v1/by-puuid/mmr-history/<region>/<puuid>
+
+Record more with bench/record.py.
+"""
+import gzip
+import json
+import os
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class Corpus:
+    """Fixture bodies indexed the way the API addresses them"""
+    def __init__(self, directory=FIXTURE_DIR):
+        self.matches: dict[str, bytes] = {}
+        self.accounts: dict[str, bytes] = {}
+        self.mmrHistory: dict[str, bytes] = {}
+        self.riotIDs: dict[tuple[str, str], str] = {} # (name, tag) lowercased -> puuid
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.json.gz'):
+                continue
+            kind, _, key = filename[:-len('.json.gz')].partition('_')
+            with gzip.open(os.path.join(directory, filename), 'rb') as f:
+                body = f.read()
+            if kind == 'match':
+                self.matches[key] = body
+            elif kind == 'account':
+                self.accounts[key] = body
+                data = json.loads(body)["data"]
+                self.riotIDs[data["name"].lower(), data["tag"].lower()] = key
+            elif kind == 'mmr':
+                self.mmrHistory[key] = body
+        if not self.matches:
+            raise FileNotFoundError(f'No match fixtures in {directory}, run bench/record.py --synthetic')
+
+    def match_data(self, match_id):
+        '''Returns the parsed "data" object of a recorded match'''
+        return json.loads(self.matches[match_id])["data"]
+
+
+def save_fixture(kind, key, body, directory=FIXTURE_DIR):
+    '''Writes one response body (a JSON-serializable object) as a fixture'''
+    os.makedirs(directory, exist_ok=True)
+    raw = json.dumps(body, separators=(',', ':')).encode('utf-8')
+    with open(os.path.join(directory, f'{kind}_{key}.json.gz'), 'wb') as f:
+        f.write(gzip.compress(raw, mtime=0)) # mtime=0 keeps re-recorded fixtures byte-identical
@@ -0,0 +1,63 @@
+"""Records API responses into bench/fixtures.
+
+    python bench/record.py --synthetic                     # regenerate the built-in corpus
+    python bench/record.py --player NAME#TAG [MATCH_ID ...] # record live responses
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import ValFunc as vf
+from corpus import save_fixture
+from synthetic import make_match
+
+SYNTHETIC_MATCHES = { # name: make_match arguments
+    'regular': dict(rounds=24, seed=1, mapName='Lotus'),
+    'overtime': dict(rounds=34, seed=2, mapName='Ascent'),
+    'surrender': dict(rounds=15, seed=3, mapName='Bind', surrender=True),
+}
+
+
+def record_synthetic():
+    matchIDs = []
+    for name, kwargs in SYNTHETIC_MATCHES.items():
+        data = make_match(**kwargs)
+        matchID = data["metadata"]["matchid"]
+        matchIDs.append(matchID)
+        save_fixture('match', matchID, {"status": 200, "data": data})
+        print(f'{name}: {matchID}')
+    player = data["players"]["all_players"][0]
+    save_fixture('account', player["puuid"], {"status": 200, "data": {
+        "puuid": player["puuid"], "region": 'na', "account_level": 100, "name": player["name"], "tag": player["tag"]
+    }})
+    save_fixture('mmr', player["puuid"], {"status": 200, "name": player["name"], "tag": player["tag"], "data": [
+        {"match_id": matchID, "currenttier": 12, "currenttierpatched": 'Gold 1', "mmr_change_to_last_game": 18}
+        for matchID in matchIDs
+    ]})
+
+
+def record_live(riotID, matchIDs):
+    username, tagline = vf.str_to_user_gt(riotID)
+    account = vf.getJSON(f'{vf.API_BASE}/v1/account/{username}/{tagline}')
+    puuid = account["data"]["puuid"]
+    save_fixture('account', puuid, account)
+    mmr = vf.getJSON(f'{vf.API_BASE}/v1/by-puuid/mmr-history/{account["data"]["region"]}/{puuid}')
+    save_fixture('mmr', puuid, mmr)
+    for matchID in matchIDs or [i["match_id"] for i in mmr["data"]]:
+        save_fixture('match', matchID, vf.getJSON(f'{vf.API_BASE}/v2/match/{matchID}'))
+        print(f'recorded {matchID}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Record API responses as benchmark fixtures.')
+    parser.add_argument('--synthetic', action='store_true', help='write the built-in synthetic corpus')
+    parser.add_argument('--player', help='Riot ID whose account and mmr-history to record')
+    parser.add_argument('match_ids', nargs='*', help='matches to record (default: the player\'s recent matches)')
+    args = parser.parse_args()
+    if args.synthetic:
+        record_synthetic()
+    elif args.player:
+        record_live(args.player, args.match_ids)
+    else:
+        parser.error('pass --synthetic or --player')
@@ -0,0 +1,154 @@
+"""Offline benchmark harness.
+
+Times each stage of a chapter lookup against the recorded corpus and the
+local stub server, with no traffic to api.henrikdev.xyz:
+
+    fetch        getJSON of a match through the stub (latency, keep-alive, 429 retries)
+    decode       json.loads of a recorded match body
+    matchstats   MatchStats construction
+    playerstats  PlayerMatchStats construction (includes MatchStats)
+    chapters     PlayerMatchStats.get_chapters
+    startup      importing gui.py in a fresh interpreter (skipped without customtkinter)
+
+Reports throughput and p50/p99 latency per stage. With a baseline file, any
+tracked number more than --threshold worse than the baseline fails the run.
+
+    python bench/run.py                    # compare against bench/baseline.json if present
+    python bench/run.py --save-baseline    # record the current numbers as the baseline
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+os.environ['VALTIME_COORDINATOR'] = 'off' # time the stub, not a running coordinator's memory cache
+import ValFunc as vf
+from corpus import Corpus
+from stub_server import StubServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+# prints the import time, and fails if a dependency that should load lazily came along
+STARTUP_SCRIPT = '''import sys, time
+start = time.perf_counter()
+import gui
+print(time.perf_counter() - start)
+eager = [name for name in ('requests', 'ijson') if name in sys.modules]
+sys.exit(f'imported at startup: {eager}' if eager else 0)
+'''
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def measure(func, cases, iterations):
+    '''Calls func(case) for every case, iterations times over, returning per-call seconds'''
+    samples = []
+    for _ in range(iterations):
+        for case in cases:
+            start = time.perf_counter()
+            func(case)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure_startup(runs):
+    '''Times importing the GUI module in fresh interpreters, returning per-run seconds (None without customtkinter)'''
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=SRC_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            if 'customtkinter' in proc.stderr:
+                return None
+            raise RuntimeError(f'GUI startup check failed: {proc.stderr.strip()}')
+        samples.append(float(proc.stdout.split()[0]))
+    return samples
+
+
+def summarize(samples):
+    return {
+        "ops_per_sec": len(samples) / sum(samples),
+        "p50_ms": percentile(samples, 50) * 1e3,
+        "p99_ms": percentile(samples, 99) * 1e3,
+    }
+
+
+def run_stages(corpus, iterations, latencyMs, throttleEvery):
+    matchIDs = list(corpus.matches)
+    datas = [corpus.match_data(matchID) for matchID in matchIDs]
+    playerCases = [(data, data["players"]["all_players"][0]["puuid"]) for data in datas]
+    parsed = [vf.PlayerMatchStats(None, puuid, data) for data, puuid in playerCases]
+    results = {}
+    with StubServer(corpus, latencyMs=latencyMs, throttleEvery=throttleEvery, rateLimit=100_000) as stub:
+        vf.API_BASE = stub.url
+        vf.getJSON(f'{vf.API_BASE}/v2/match/{matchIDs[0]}') # warm the connection pool
+        results["fetch"] = summarize(measure(lambda matchID: vf.getJSON(f'{vf.API_BASE}/v2/match/{matchID}'), matchIDs, iterations))
+        results["fetch"]["throttled"] = stub.throttled
+    results["decode"] = summarize(measure(lambda matchID: json.loads(corpus.matches[matchID]), matchIDs, iterations))
+    results["matchstats"] = summarize(measure(lambda data: vf.MatchStats(data, 'Red'), datas, iterations))
+    results["playerstats"] = summarize(measure(lambda case: vf.PlayerMatchStats(None, case[1], case[0]), playerCases, iterations))
+    results["chapters"] = summarize(measure(lambda stats: stats.get_chapters(60), parsed, iterations))
+    startup = measure_startup(min(iterations, 10)) # a fresh interpreter per run is slow
+    if startup is not None:
+        results["startup"] = summarize(startup)
+    return results
+
+
+def compare(results, baseline, threshold):
+    '''Returns a list of regressions worse than threshold (a fraction) vs the baseline'''
+    regressions = []
+    for stage, numbers in results.items():
+        base = baseline.get(stage)
+        if base is None:
+            continue
+        for key in ('p50_ms', 'p99_ms'):
+            if key in base and numbers[key] > base[key] * (1 + threshold):
+                regressions.append(f'{stage} {key}: {numbers[key]:.3f} vs baseline {base[key]:.3f}')
+        if "ops_per_sec" in base and numbers["ops_per_sec"] < base["ops_per_sec"] / (1 + threshold):
+            regressions.append(f'{stage} ops_per_sec: {numbers["ops_per_sec"]:.1f} vs baseline {base["ops_per_sec"]:.1f}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the offline benchmarks.')
+    parser.add_argument('-n', '--iterations', type=int, default=50, help='passes over the corpus per stage')
+    parser.add_argument('--latency-ms', type=float, default=20, help='latency added by the stub server')
+    parser.add_argument('--throttle-every', type=int, default=25, help='stub answers every Nth request with a 429 (0 = never)')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown vs baseline, as a fraction')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    corpus = Corpus()
+    results = run_stages(corpus, args.iterations, args.latency_ms, args.throttle_every)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f'{len(corpus.matches)} matches x {args.iterations} iterations')
+        print(f'{"stage":<12} {"ops/s":>10} {"p50 ms":>9} {"p99 ms":>9}')
+        for stage, numbers in results.items():
+            print(f'{stage:<12} {numbers["ops_per_sec"]:>10.1f} {numbers["p50_ms"]:>9.3f} {numbers["p99_ms"]:>9.3f}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline first to check for regressions', file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Local stand-in for api.henrikdev.xyz that replays a Corpus.
+
+    with StubServer(Corpus(), latencyMs=80, throttleEvery=10) as stub:
+        ValFunc.API_BASE = stub.url
+
+Serves the account, mmr-history and v2 match endpoints with optional added
+latency, sends x-ratelimit-* headers, and answers every Nth request with a
+429 + Retry-After so client backoff can be measured.
+
+    python bench/stub_server.py [--port 8765] [--latency-ms 80]
+"""
+import argparse
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote
+
+from corpus import Corpus
+
+ROUTES = [
+    (re.compile(r'^/valorant/v2/match/([^/]+)$'), 'match'),
+    (re.compile(r'^/valorant/v1/account/([^/]+)/([^/]+)$'), 'riotID'),
+    (re.compile(r'^/valorant/v1/by-puuid/account/([^/]+)$'), 'account'),
+    (re.compile(r'^/valorant/v1/by-puuid/mmr-history/[^/]+/([^/]+)$'), 'mmr'),
+]
+NOT_FOUND = b'{"status":404,"errors":[{"message":"Not found","code":0,"details":"null"}]}'
+THROTTLED = b'{"status":429,"errors":[{"message":"Rate Limited","code":0,"details":"null"}]}'
+
+
+class StubServer:
+    """Threaded HTTP server replaying recorded responses"""
+    def __init__(self, corpus, port=0, latencyMs=0, throttleEvery=0, retryAfterSec=0.05, rateLimit=90):
+        self.corpus: Corpus = corpus
+        self.latencyMs: float = latencyMs
+        self.throttleEvery: int = throttleEvery # 0 never throttles
+        self.retryAfterSec: float = retryAfterSec
+        self.rateLimit: int = rateLimit
+        self.requests: int = 0
+        self.throttled: int = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), _make_handler(self))
+        self.httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.httpd.server_port}/valorant'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def respond(self, path):
+        '''Returns (status, body) for a request path'''
+        with self._lock:
+            self.requests += 1
+            throttle = self.throttleEvery and self.requests % self.throttleEvery == 0
+            if throttle:
+                self.throttled += 1
+        if throttle:
+            return 429, THROTTLED
+        for pattern, kind in ROUTES:
+            match = pattern.match(unquote(path))
+            if match is None:
+                continue
+            if kind == 'match':
+                body = self.corpus.matches.get(match[1])
+            elif kind == 'riotID':
+                puuid = self.corpus.riotIDs.get((match[1].lower(), match[2].lower()))
+                body = self.corpus.accounts.get(puuid) if puuid is not None else None
+            elif kind == 'account':
+                body = self.corpus.accounts.get(match[1])
+            else:
+                body = self.corpus.mmrHistory.get(match[1])
+            if body is not None:
+                return 200, body
+            break
+        return 404, NOT_FOUND
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' # keep-alive, like the real API
+
+        def do_GET(self):
+            if server.latencyMs:
+                time.sleep(server.latencyMs / 1000)
+            status, body = server.respond(self.path)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('x-ratelimit-limit', str(server.rateLimit))
+            self.send_header('x-ratelimit-remaining', str(server.rateLimit))
+            self.send_header('x-ratelimit-reset', '60')
+            if status == 429:
+                self.send_header('Retry-After', str(server.retryAfterSec))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+    return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve recorded API responses locally.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--throttle-every', type=int, default=0, help='answer every Nth request with a 429')
+    args = parser.parse_args()
+    stub = StubServer(Corpus(), args.port, args.latency_ms, args.throttle_every)
+    print(f'Serving on {stub.url} (set VALTIME_API_BASE to use it)')
+    try:
+        stub.httpd.serve_forever()
+    except KeyboardInterrupt:
+        stub.httpd.server_close()
@@ -0,0 +1,103 @@
+"""Generates synthetic v2 match payloads shaped like api.henrikdev.xyz responses."""
+import random
+
+AGENTS = ['Jett', 'Sova', 'Omen', 'Killjoy', 'Skye', 'Reyna', 'Viper', 'Cypher', 'Raze', 'Breach']
+END_TYPES = ['Eliminated', 'Bomb defused', 'Bomb detonated', 'Round timer expired']
+
+
+def make_match(rounds=24, seed=0, mapName='Lotus', surrender=False):
+    '''Returns a v2 match "data" object with the given number of rounds'''
+    rng = random.Random(seed)
+    players = []
+    for i in range(10):
+        players.append({
+            "puuid": f'00000000-0000-0000-0000-{i:012x}', # same lobby in every match
+            "name": f'Player{i}',
+            "tag": 'TAG',
+            "team": 'Red' if i < 5 else 'Blue',
+            "character": AGENTS[i],
+            "currenttier": 12 + i,
+            "currenttier_patched": 'Gold 1',
+            "stats": {"score": rng.randint(100, 350) * rounds, "kills": 0, "deaths": 0, "assists": rng.randint(0, 10)},
+        })
+    teamOf = {p["puuid"]: p["team"] for p in players}
+    kills = []
+    roundList = []
+    matchTime = 56_000
+    redScore = blueScore = 0
+    for r in range(rounds):
+        alive = [p["puuid"] for p in players]
+        timeInRound = rng.randint(3_000, 10_000)
+        lastKill = None
+        numKills = rng.randint(3, 10)
+        for _ in range(numKills):
+            red = [p for p in alive if teamOf[p] == 'Red']
+            blue = [p for p in alive if teamOf[p] == 'Blue']
+            if not red or not blue:
+                break
+            killerTeam = rng.choice(['Red', 'Blue'])
+            killer = rng.choice(red if killerTeam == 'Red' else blue)
+            victim = rng.choice(blue if killerTeam == 'Red' else red)
+            alive.remove(victim)
+            kills.append({
+                "round": r,
+                "kill_time_in_round": timeInRound,
+                "kill_time_in_match": matchTime + timeInRound,
+                "killer_puuid": killer,
+                "killer_team": killerTeam,
+                "victim_puuid": victim,
+                "victim_team": teamOf[victim],
+                "player_locations_on_kill": [
+                    {"player_puuid": p, "player_team": teamOf[p], "location": {"x": 0, "y": 0}, "view_radians": 0.0}
+                    for p in alive
+                ],
+            })
+            lastKill = timeInRound
+            timeInRound += rng.randint(1_000, 9_000)
+        red = [p for p in alive if teamOf[p] == 'Red']
+        blue = [p for p in alive if teamOf[p] == 'Blue']
+        if not red or not blue:
+            endType = 'Eliminated'
+            winner = 'Red' if red else 'Blue'
+            length = lastKill
+        else:
+            endType = rng.choice(END_TYPES[1:])
+            winner = rng.choice(['Red', 'Blue'])
+            length = {'Bomb defused': timeInRound, 'Bomb detonated': timeInRound + 45_000}.get(endType, 100_000)
+        if surrender and r == rounds - 1:
+            endType = 'Surrendered'
+            winner = 'Red'
+        if winner == 'Red':
+            redScore += 1
+        else:
+            blueScore += 1
+        roundList.append({
+            "winning_team": winner,
+            "end_type": endType,
+            "bomb_planted": endType == 'Bomb detonated',
+            "plant_events": {"plant_time_in_round": timeInRound} if endType == 'Bomb detonated' else {},
+            "defuse_events": {"defuse_time_in_round": timeInRound} if endType == 'Bomb defused' else {},
+            # the bulky per-round section the parser never reads
+            "player_stats": [
+                {"player_puuid": p["puuid"], "damage_events": [{"damage": rng.randint(1, 150)} for _ in range(5)],
+                 "economy": {"loadout_value": rng.randint(0, 9000), "remaining": rng.randint(0, 9000)}}
+                for p in players
+            ],
+        })
+        matchTime += length + (52_000 if r == 11 else 37_000)
+    return {
+        "metadata": {
+            "map": mapName,
+            "game_length": matchTime,
+            "game_start": 1_700_000_000 + seed * 3_600,
+            "rounds_played": rounds,
+            "mode": 'Competitive',
+            "matchid": f'{seed:08x}-1111-2222-3333-444444444444',
+            "region": 'na',
+        },
+        "players": {"all_players": players},
+        "teams": {"red": {"has_won": redScore > blueScore, "rounds_won": redScore},
+                  "blue": {"has_won": blueScore > redScore, "rounds_won": blueScore}},
+        "rounds": roundList,
+        "kills": kills,
+    }
@@ -0,0 +1,179 @@
+import random
+import threading
+import time
+import Metrics
+
+
+PRIORITY_INTERACTIVE = 0 # user is waiting on the result
+PRIORITY_BACKGROUND = 1 # prefetching, batch jobs
+_NUM_PRIORITIES = 2
+
+
+class TokenBucket:
+    """Request throttle shared by every caller of an APIClient.
+
+    Starts from a conservative guess and is resynced from the API's rate-limit
+    headers after every response. Waiting interactive requests always get the
+    next token before any waiting background request.
+    """
+    def __init__(self, capacity=30, windowSec=60):
+        self.capacity: float = capacity
+        self.refillPerSec: float = capacity / windowSec
+        self._tokens: float = capacity
+        self._lastRefill: float = time.monotonic()
+        self._pausedUntil: float = 0.0
+        self._waiting: list[int] = [0] * _NUM_PRIORITIES
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._lastRefill) * self.refillPerSec)
+        self._lastRefill = now
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        '''Blocks until a request of the given priority may be sent'''
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    ahead = any(self._waiting[p] for p in range(priority))
+                    if now >= self._pausedUntil and self._tokens >= 1 and not ahead:
+                        self._tokens -= 1
+                        return
+                    if now < self._pausedUntil:
+                        wait = self._pausedUntil - now
+                    elif self._tokens < 1:
+                        wait = (1 - self._tokens) / self.refillPerSec
+                    else:
+                        wait = 0.05 # a higher priority request is about to take the token
+                    self._cond.wait(min(max(wait, 0.01), 1.0))
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def pause(self, seconds):
+        '''Stops handing out tokens for the given number of seconds'''
+        with self._cond:
+            self._pausedUntil = max(self._pausedUntil, time.monotonic() + seconds)
+
+    def update(self, limit=None, remaining=None, resetSec=None):
+        '''Resyncs the bucket with the limits reported by the API'''
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None and limit > 0:
+                self.capacity = limit
+                if resetSec is not None and resetSec > 0:
+                    # spread what's left of the window evenly instead of bursting
+                    self.refillPerSec = max(limit / 60, (remaining or 0) / resetSec)
+                else:
+                    self.refillPerSec = limit / 60
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+                if remaining <= 0 and resetSec is not None:
+                    self._pausedUntil = max(self._pausedUntil, now + resetSec)
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers):
+        '''Resyncs the bucket from x-ratelimit-* response headers, if present'''
+        self.update(
+            _header_num(headers, 'x-ratelimit-limit'),
+            _header_num(headers, 'x-ratelimit-remaining'),
+            _header_num(headers, 'x-ratelimit-reset')
+        )
+
+
+def _header_num(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class APIClient:
+    """Pooled, rate-limited HTTP client used for every API request.
+
+    Keeps connections alive across requests, throttles through a shared
+    TokenBucket and retries 429/5xx responses and connection failures with
+    jittered exponential backoff (honouring Retry-After when sent).
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, poolSize=10, maxRetries=4, backoffBase=0.5, backoffCap=16.0, timeout=5):
+        self.maxRetries: int = maxRetries
+        self.backoffBase: float = backoffBase
+        self.backoffCap: float = backoffCap
+        self.timeout: float = timeout
+        self.bucket = TokenBucket()
+        import requests # imported here so importing this module (and the GUI) stays quick
+        from requests.adapters import HTTPAdapter
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff(self, attempt, response=None):
+        if response is not None:
+            retryAfter = _header_num(response.headers, 'retry-after')
+            if retryAfter is not None:
+                return retryAfter
+        # "full jitter": random point in an exponentially growing window
+        return random.uniform(0, min(self.backoffCap, self.backoffBase * 2 ** attempt))
+
+    def connect(self, url, priority=PRIORITY_BACKGROUND):
+        '''Opens a pooled connection to url's host so the next request skips the TCP/TLS handshake.
+        No HTTP request is sent, so this costs no rate-limit token (priority is kept for callers). Errors are ignored.'''
+        try:
+            adapter = self.session.get_adapter(url)
+            pool = adapter.get_connection(url) # the pool session.get() will use (no proxies)
+            adapter.cert_verify(pool, url, self.session.verify, self.session.cert)
+            conn = pool._get_conn()
+            try:
+                conn.timeout = self.timeout
+                conn.connect()
+            finally:
+                pool._put_conn(conn) # back into the pool, ready for the first request
+        except Exception: # best effort: the first request just connects itself
+            pass
+
+    def get(self, url, priority=PRIORITY_INTERACTIVE, stream=False, headers=None) -> 'requests.Response':
+        '''Sends a throttled GET, retrying rate limits, server errors and dropped connections.
+        With stream=True the body is left unread for the caller to consume from r.raw.'''
+        import requests # already loaded by __init__
+        attempt = 0
+        while True:
+            with Metrics.span('http.rate_limit_wait'):
+                self.bucket.acquire(priority)
+            Metrics.incr('http.requests')
+            try:
+                with Metrics.span('http.request'):
+                    r = self.session.get(url, timeout=self.timeout, stream=stream, headers=headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.maxRetries:
+                    raise
+                Metrics.incr('http.retries')
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            if Metrics.enabled:
+                # connect + TLS + server time until the response headers arrived
+                Metrics.record('http.time_to_headers', r.elapsed.total_seconds())
+            self.bucket.update_from_headers(r.headers)
+            if r.status_code in self.RETRY_STATUSES and attempt < self.maxRetries:
+                delay = self._backoff(attempt, r)
+                if r.status_code == 429:
+                    Metrics.incr('http.throttled')
+                    self.bucket.pause(delay) # hold back every other caller too
+                Metrics.incr('http.retries')
+                r.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+            return r
+
+    def close(self):
+        self.session.close()
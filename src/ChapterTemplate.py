@@ -0,0 +1,254 @@
+"""Chapter templates, compiled once and rendered to several export formats.
+
+A template is text with `{field}` / `{field:spec}` placeholders, as in
+str.format. A section in square brackets is optional: it is left out when any
+field in it is empty (None, or False for `clutch`). Literal brackets are
+doubled, like braces. `{clutch}` renders as its spec text (default CLUTCH).
+
+    '{time} Round {round} | {score}[ | {kills}k][ | {clutch:CLUTCH}]'
+
+Fields: round, score, map, match, team, agent, rank, kills, clutch, clutcher,
+time (YouTube style, m:ss / h:mm:ss), start/end (VOD seconds), start_ms/end_ms
+and start_ts/end_ts (HH:MM:SS.mmm); the last four are clamped at 0.
+
+Each template is compiled once into a small Python function, so rendering is
+one call per chapter with no parsing.
+"""
+import functools
+import json
+import string
+from dataclasses import dataclass, fields
+
+
+@dataclass(slots=True)
+class Chapter:
+    round: int # 1-based
+    start: int # seconds into the VOD, negative if before it starts
+    end: int
+    score: str # before the round, own team first
+    map: str
+    match: int = 0 # index of the match in a multi-match VOD
+    team: str | None = None
+    agent: str | None = None
+    rank: str | None = None
+    kills: int | None = None # by the player (or team); None for plain match chapters
+    clutch: bool = False
+    clutcher: str | None = None # agent(s) who clutched the round
+
+CHAPTER_FIELDS = [field.name for field in fields(Chapter)]
+
+
+def youtube_time(sec):
+    '''Formats seconds as m:ss or h:mm:ss, with a leading - if negative'''
+    sign = '-' if sec < 0 else ''
+    sec = abs(sec)
+    if sec < 3600:
+        return f'{sign}{sec // 60}:{sec % 60:02d}'
+    return f'{sign}{sec // 3600}:{(sec // 60) % 60:02d}:{sec % 60:02d}'
+
+def timestamp(sec):
+    '''Formats seconds as HH:MM:SS.000 (WebVTT), clamped at 0'''
+    sec = max(sec, 0)
+    return f'{sec // 3600:02d}:{(sec // 60) % 60:02d}:{sec % 60:02d}.000'
+
+def escape_ffmpeg(text):
+    return text.replace('\\', '\\\\').replace('=', '\\=').replace(';', '\\;').replace('#', '\\#').replace('\n', '\\\n')
+
+def escape_vtt(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+# placeholder -> (Python expression on the chapter `c`, is the value a str, can it be None)
+FIELDS = {
+    'round': ('c.round', False, False),
+    'score': ('c.score', True, False),
+    'map': ('c.map', True, False),
+    'match': ('c.match + 1', False, False),
+    'team': ('c.team', True, True),
+    'agent': ('c.agent', True, True),
+    'rank': ('c.rank', True, True),
+    'kills': ('c.kills', False, True),
+    'clutch': ('c.clutch', False, True), # special-cased: renders its spec text when true
+    'clutcher': ('c.clutcher', True, True),
+    'time': ("f'{c.start // 60}:{c.start % 60:02d}' if 0 <= c.start < 3600 else _youtube_time(c.start)", True, False),
+    'start': ('c.start', False, False),
+    'end': ('c.end', False, False),
+    'start_ms': ('max(c.start, 0) * 1000', False, False),
+    'end_ms': ('max(c.end, 0) * 1000', False, False),
+    'start_ts': ('_timestamp(c.start)', True, False),
+    'end_ts': ('_timestamp(c.end)', True, False),
+}
+_formatter = string.Formatter()
+
+
+class TemplateError(ValueError):
+    """Raised when a chapter template can't be compiled."""
+    pass
+
+
+def _split_sections(text):
+    '''Splits text on unescaped [ ] into [(optional, text)]'''
+    sections = []
+    current = ''
+    optional = False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in '[]' and text[i:i + 2] == char * 2:
+            current += char
+            i += 2
+            continue
+        if char == '[':
+            if optional:
+                raise TemplateError('Optional sections can\'t be nested')
+            sections.append((False, current))
+            current, optional = '', True
+        elif char == ']':
+            if not optional:
+                raise TemplateError('Unmatched ]')
+            sections.append((True, current))
+            current, optional = '', False
+        else:
+            current += char
+        i += 1
+    if optional:
+        raise TemplateError('Unclosed [')
+    sections.append((False, current))
+    return [(optional, text) for optional, text in sections if text]
+
+
+def _compile(text, escape):
+    '''Compiles a template to a function chapter -> str.
+
+    The template becomes the source of one small function: field values are
+    computed into locals and each section is an f-string, so rendering a
+    line is a single call with no parsing. Only expressions from FIELDS and
+    repr()'d constants go into the source.
+    '''
+    body: list[str] = []
+    sections: list[str] = []
+    n = 0
+    try:
+        for optional, sectionText in _split_sections(text):
+            content = ''
+            conditions: list[str] = []
+            for literal, name, spec, conversion in _formatter.parse(sectionText):
+                content += literal.replace('{', '{{').replace('}', '}}')
+                if name is None:
+                    continue
+                if name not in FIELDS:
+                    raise TemplateError(f'Unknown chapter field {{{name}}}')
+                if conversion is not None:
+                    raise TemplateError(f'Conversions are not supported ({{{name}!{conversion}}})')
+                expr, isStr, nullable = FIELDS[name]
+                var = f'v{n}'
+                n += 1
+                if name == 'clutch':
+                    clutchText = spec or 'CLUTCH'
+                    if escape is not None:
+                        clutchText = escape(clutchText)
+                    body.append(f'{var} = {clutchText!r} if c.clutch else None')
+                else:
+                    if spec:
+                        try:
+                            format('' if isStr else 0, spec) # fail now, not on every render
+                        except (ValueError, TypeError) as e:
+                            raise TemplateError(f'Invalid format spec in {{{name}:{spec}}}: {e}') from e
+                    body.append(f'{var} = {expr}')
+                    valueText = var if isStr and not spec else f'format({var}, {spec!r})'
+                    if escape is not None:
+                        valueText = f'_escape({valueText})'
+                    if valueText != var:
+                        body.append(f'{var} = {valueText}' if not nullable else f'{var} = {valueText} if {var} is not None else None')
+                if nullable:
+                    if optional:
+                        conditions.append(f'{var} is not None')
+                    else:
+                        body.append(f"{var} = '' if {var} is None else {var}")
+                content += '{' + var + '}'
+            if not content:
+                continue
+            section = 'f' + repr(content) # only literals and {vN} in here
+            sections.append(f"({section} if {' and '.join(conditions)} else '')" if conditions else section)
+    except ValueError as ve: # str.format syntax errors
+        if isinstance(ve, TemplateError):
+            raise
+        raise TemplateError(f'Invalid template: {ve}') from ve
+    source = 'def render(c):\n' + ''.join(f'    {line}\n' for line in body) + f"    return {' + '.join(sections) or repr('')}\n"
+    namespace = {'_youtube_time': youtube_time, '_timestamp': timestamp, '_escape': escape}
+    exec(source, namespace)
+    return namespace['render']
+
+
+class ChapterTemplate:
+    """A compiled text format: a prologue, an optional header line per match and one line per chapter"""
+    def __init__(self, line, header=None, prologue='', separator='', escape=None, extension='txt'):
+        self.prologue: str = prologue # once, before everything
+        self.separator: str = separator # between matches of a multi-match VOD
+        self.extension: str = extension
+        self._line = _compile(line, escape)
+        self._header = _compile(header, escape) if header is not None else None
+
+    def render(self, chapters) -> str:
+        '''Renders a list of Chapters (from one or more matches) to text'''
+        out = [self.prologue]
+        line = self._line
+        match = None
+        for chapter in chapters:
+            if chapter.match != match:
+                if match is not None:
+                    out.append(self.separator)
+                match = chapter.match
+                if self._header is not None:
+                    header = self._header(chapter)
+                    if header:
+                        out.append(header + '\n')
+            out.append(line(chapter) + '\n')
+        return ''.join(out)
+
+
+class JSONFormat:
+    """Chapters as a JSON array of objects with every Chapter field"""
+    extension = 'json'
+
+    def render(self, chapters) -> str:
+        return json.dumps([{name: getattr(chapter, name) for name in CHAPTER_FIELDS} for chapter in chapters], indent=2) + '\n'
+
+
+YOUTUBE_HEADER = '[{agent} {map} {rank}]'
+FORMATS = {
+    'youtube': ChapterTemplate(
+        '{time} Round {round} | {score}[ | {kills}k][ | {clutch:CLUTCH}]',
+        header=YOUTUBE_HEADER, separator='\n'
+    ),
+    'ffmpeg': ChapterTemplate(
+        '[[CHAPTER]]\nTIMEBASE=1/1000\nSTART={start_ms}\nEND={end_ms}\ntitle=Round {round} | {score}[ | {kills}k][ | {clutch:CLUTCH}]',
+        prologue=';FFMETADATA1\n', escape=escape_ffmpeg, extension='ffmeta'
+    ),
+    'vtt': ChapterTemplate(
+        '{start_ts} --> {end_ts}\n[{agent} {map} - ]Round {round} | {score}[ | {kills}k][ | {clutch:CLUTCH}]\n',
+        prologue='WEBVTT\n\n', escape=escape_vtt, extension='vtt'
+    ),
+    'json': JSONFormat(),
+}
+# LobbyStats.get_team_chapters: team kills and the agent who clutched
+TEAM_YOUTUBE = ChapterTemplate(
+    '{time} Round {round} | {score} | {kills}k[ | CLUTCH {clutcher}]',
+    header='[{team} {map}]', separator='\n'
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_line(line):
+    return ChapterTemplate(line, header=YOUTUBE_HEADER, separator='\n')
+
+
+def get_format(template=None):
+    '''Returns a renderer for a format name, a line template (YouTube-style layout) or an existing renderer'''
+    if template is None:
+        return FORMATS['youtube']
+    if isinstance(template, str):
+        if template in FORMATS:
+            return FORMATS[template]
+        return _compile_line(template) # compiled once per distinct template
+    return template
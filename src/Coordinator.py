@@ -0,0 +1,311 @@
+"""Local request coordinator shared by every ValTime process on the machine.
+
+    python Coordinator.py [--socket PATH]
+
+The daemon listens on a Unix socket and sends every API request through one
+APIClient, so GUI windows, batch jobs and watchers share a single token
+bucket (priorities still apply across processes). Identical requests that
+arrive while one is in flight wait for that one. Recent responses are kept
+in memory and served to later callers.
+
+getJSON talks to the daemon through CoordinatorClient (see ValFunc.get_client)
+and falls back to sending requests itself when no daemon is running, or on
+platforms without Unix sockets. Set VALTIME_COORDINATOR to another socket
+path, or to "off" to always send requests directly.
+
+Protocol: one JSON line per request ({"url", "priority", "headers"}); the
+reply is one JSON line ({"status", "headers", "length"} or {"error",
+"message"}) followed by `length` bytes of body.
+"""
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import Metrics
+from APIClient import APIClient, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from MatchCache import default_cache_dir
+
+UNIX_SOCKETS: bool = hasattr(socket, 'AF_UNIX')
+KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'x-ratelimit-limit', 'x-ratelimit-remaining', 'x-ratelimit-reset')
+
+
+def default_socket_path():
+    '''Returns the socket path from VALTIME_COORDINATOR, or the one in the cache directory ("off" disables)'''
+    path = os.environ.get('VALTIME_COORDINATOR')
+    if path is not None:
+        return None if path.lower() == 'off' else path
+    return os.path.join(default_cache_dir('coordinator'), 'coordinator.sock')
+
+
+class ResponseCache:
+    """Size-bounded in-memory LRU of successful responses with per-URL lifetimes"""
+    MATCH_TTL_SEC = 24 * 3600 # finished matches never change
+    DEFAULT_TTL_SEC = 30 # accounts, match history
+
+    def __init__(self, maxBytes=64 * 1024 * 1024):
+        self.maxBytes: int = maxBytes
+        self.size: int = 0
+        self._entries: OrderedDict[str, tuple[float, dict, bytes]] = OrderedDict() # url -> (expires, headers, body)
+        self._lock = threading.Lock()
+
+    def ttl(self, url):
+        return self.MATCH_TTL_SEC if '/v2/match/' in url else self.DEFAULT_TTL_SEC
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(url)
+                return None
+            self._entries.move_to_end(url)
+            return entry[1], entry[2]
+
+    def put(self, url, headers, body):
+        if len(body) > self.maxBytes:
+            return
+        with self._lock:
+            self._remove(url)
+            self._entries[url] = (time.monotonic() + self.ttl(url), headers, body)
+            self.size += len(body)
+            while self.size > self.maxBytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, url):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.size -= len(entry[2])
+
+
+def _read_reply(sock):
+    '''Reads one JSON line plus its body from the socket'''
+    reader = sock.makefile('rb')
+    line = reader.readline()
+    if not line:
+        raise ConnectionError('Coordinator closed the connection')
+    reply = json.loads(line)
+    body = reader.read(reply.get("length", 0))
+    return reply, body
+
+
+if UNIX_SOCKETS:
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                status, headers, body = self.server.fetch(request["url"], request.get("priority", PRIORITY_INTERACTIVE), request.get("headers"))
+                reply = {"status": status, "headers": headers, "length": len(body)}
+            except Exception as e: # reported to the client, which raises the matching requests error
+                reply, body = {"error": type(e).__name__, "message": str(e)}, b''
+            try:
+                self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+                if body:
+                    self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError): # the client gave up or already has what it needs
+                pass
+
+
+    class CoordinatorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """The coordinator daemon: one APIClient, merged in-flight requests and a ResponseCache"""
+        daemon_threads = True
+
+        def __init__(self, path=None, client=None, cache=None):
+            self.path: str = path or default_socket_path()
+            self.client = client or APIClient()
+            self.cache = cache or ResponseCache()
+            self._pending: dict[tuple, Future] = {}
+            self._lock = threading.Lock()
+            self._remove_stale_socket()
+            socketserver.UnixStreamServer.__init__(self, self.path, _Handler)
+            os.chmod(self.path, 0o600) # this user's processes only
+
+        def _remove_stale_socket(self):
+            if not os.path.exists(self.path):
+                return
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.remove(self.path) # left behind by a daemon that didn't shut down cleanly
+            else:
+                raise OSError(f'A coordinator is already listening on {self.path}')
+            finally:
+                probe.close()
+
+        def fetch(self, url, priority=PRIORITY_INTERACTIVE, headers=None):
+            '''Returns (status, headers, body) from the cache, an identical request in flight, or the API'''
+            cached = self.cache.get(url)
+            if cached is not None: # a full 200 also answers a conditional request
+                Metrics.incr('coordinator.cache_hit')
+                return 200, cached[0], cached[1]
+            key = (url, tuple(sorted((headers or {}).items())))
+            with self._lock:
+                pending = self._pending.get(key)
+                isOwner = pending is None
+                if isOwner:
+                    pending = self._pending[key] = Future()
+            if not isOwner:
+                Metrics.incr('coordinator.merged')
+                return pending.result()
+            try:
+                r = self.client.get(url, priority, headers=headers)
+                try:
+                    result = (r.status_code, {name: r.headers[name] for name in KEPT_HEADERS if name in r.headers}, r.content)
+                finally:
+                    r.close()
+                if result[0] == 200:
+                    self.cache.put(url, result[1], result[2])
+                pending.set_result(result)
+                return result
+            except BaseException as e:
+                pending.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    del self._pending[key]
+
+        def server_close(self):
+            socketserver.UnixStreamServer.server_close(self)
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class CoordinatorClient:
+    """Drop-in for APIClient.get that goes through the coordinator daemon.
+
+    Returns real requests.Response objects, so callers handle errors the same
+    way. If the daemon can't be reached, requests are sent directly (with a
+    local APIClient) and the daemon is tried again after RETRY_SEC.
+    """
+    RETRY_SEC = 30
+
+    def __init__(self, path=None, connectTimeout=1, timeout=300):
+        self.path: str | None = path or default_socket_path()
+        self.connectTimeout: float = connectTimeout
+        self.timeout: float = timeout # also covers time spent waiting for the shared rate limit
+        self._direct: APIClient | None = None
+        self._retryAt: float = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def direct(self) -> APIClient:
+        with self._lock:
+            if self._direct is None:
+                self._direct = APIClient()
+        return self._direct
+
+    def available(self):
+        return UNIX_SOCKETS and self.path is not None and time.monotonic() >= self._retryAt
+
+    def get(self, url, priority=PRIORITY_INTERACTIVE, stream=False, headers=None):
+        '''Same as APIClient.get; stream=True still works, the body just arrives in one piece'''
+        if self.available():
+            import requests
+            try:
+                return self._request(url, priority, headers)
+            except requests.exceptions.RequestException: # the daemon answered with an error (also an OSError)
+                raise
+            except (OSError, ValueError): # no daemon, or it went away mid-reply
+                Metrics.incr('coordinator.unavailable')
+                self._retryAt = time.monotonic() + self.RETRY_SEC
+        return self.direct.get(url, priority, stream, headers)
+
+    def connect(self, url, priority=PRIORITY_BACKGROUND):
+        '''Checks for the daemon, which keeps its own connection; without one, pre-connects the direct client'''
+        if self.available():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.settimeout(self.connectTimeout)
+                probe.connect(self.path) # closed without a request line, which the daemon ignores
+                return
+            except OSError:
+                Metrics.incr('coordinator.unavailable')
+                self._retryAt = time.monotonic() + self.RETRY_SEC
+            finally:
+                probe.close()
+        self.direct.connect(url, priority)
+
+    def _request(self, url, priority, headers):
+        import requests
+        from http.client import responses
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.connectTimeout)
+            sock.connect(self.path)
+            sock.settimeout(self.timeout)
+            sock.sendall(json.dumps({"url": url, "priority": priority, "headers": headers}).encode('utf-8') + b'\n')
+            try:
+                reply, body = _read_reply(sock)
+            except TimeoutError as te: # the daemon is up but busy, so don't go around it
+                raise requests.exceptions.Timeout('Coordinator did not answer in time') from te
+        finally:
+            sock.close()
+        Metrics.incr('coordinator.requests')
+        if "error" in reply: # the daemon's request failed after its retries
+            if reply["error"] in ('ConnectionError', 'ConnectTimeout', 'ReadTimeout', 'Timeout'):
+                errorType = requests.exceptions.Timeout if 'Timeout' in reply["error"] else requests.exceptions.ConnectionError
+                raise errorType(reply["message"])
+            raise requests.exceptions.RequestException(f'{reply["error"]}: {reply["message"]}')
+        r = requests.Response()
+        r.status_code = reply["status"]
+        r.reason = responses.get(r.status_code, '')
+        r.url = url
+        r.headers = requests.structures.CaseInsensitiveDict(reply["headers"])
+        r.encoding = requests.utils.get_encoding_from_headers(r.headers) or 'utf-8'
+        r._content = body
+        r.raw = io.BytesIO(body) # for callers that stream from r.raw
+        return r
+
+
+def make_client():
+    '''Returns the client getJSON should use: a CoordinatorClient where Unix sockets exist, else an APIClient'''
+    if UNIX_SOCKETS and default_socket_path() is not None:
+        return CoordinatorClient()
+    return APIClient()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Share one rate limit and response cache between ValTime processes.')
+    parser.add_argument('--socket', help='socket path (default: VALTIME_COORDINATOR or the ValTime cache directory)')
+    parser.add_argument('--cache-mb', type=float, default=64, help='memory for cached responses')
+    parser.add_argument('--stats', action='store_true', help='print request counters on exit')
+    args = parser.parse_args(argv)
+    if not UNIX_SOCKETS:
+        print('Error: Unix sockets are not available on this platform; processes send requests directly', file=sys.stderr)
+        return 2
+    if args.stats:
+        Metrics.enable()
+    try:
+        server = CoordinatorServer(args.socket, cache=ResponseCache(int(args.cache_mb * 1024 * 1024)))
+    except OSError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 1
+    print(f'Coordinator listening on {server.path}', flush=True)
+    signal.signal(signal.SIGTERM, signal.default_int_handler) # clean up the socket when stopped by a service manager too
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.stats:
+            print(Metrics.format_snapshot(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
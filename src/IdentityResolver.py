@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict
+import Metrics
+
+
+@dataclass(slots=True)
+class Account:
+    puuid: str
+    name: str
+    tag: str
+    region: str
+    fetchedAt: float # time.time() when the record was fetched
+
+
+class IdentityResolver:
+    """Memoizes account records by Riot ID and by puuid.
+
+    One account response fills in name, tag, puuid and region in both
+    directions, so later lookups of any of them are free until the TTL
+    runs out. Concurrent lookups of the same account share one request, and
+    records are saved to `path` (if given) so they survive restarts.
+    """
+    def __init__(self, fetchByRiotID, fetchByPuuid, ttlSec=24 * 3600, path=None):
+        self.fetchByRiotID = fetchByRiotID # (username, tagline, priority) -> account "data" dict
+        self.fetchByPuuid = fetchByPuuid # (puuid, priority) -> account "data" dict
+        self.ttlSec: float = ttlSec
+        self.path: str | None = path
+        self._byPuuid: dict[str, Account] = {}
+        self._byRiotID: dict[tuple[str, str], str] = {} # (name, tag) lowercased -> puuid
+        self._pending: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._loaded: bool = path is None
+
+    @staticmethod
+    def _riot_key(username, tagline):
+        return username.strip().lower(), tagline.strip().lower()
+
+    def by_riot_id(self, username, tagline, priority=0) -> Account:
+        '''Returns the account for a Riot ID, fetching it only if not cached'''
+        riotKey = self._riot_key(username, tagline)
+        return self._resolve(('riot',) + riotKey, lambda: self.fetchByRiotID(username, tagline, priority))
+
+    def by_puuid(self, puuid, priority=0) -> Account:
+        '''Returns the account for a puuid, fetching it only if not cached'''
+        return self._resolve(('puuid', puuid), lambda: self.fetchByPuuid(puuid, priority))
+
+    def _lookup(self, key):
+        if key[0] == 'riot':
+            puuid = self._byRiotID.get(key[1:])
+            account = self._byPuuid.get(puuid) if puuid is not None else None
+        else:
+            account = self._byPuuid.get(key[1])
+        if account is not None and time.time() - account.fetchedAt < self.ttlSec:
+            return account
+        return None
+
+    def _resolve(self, key, fetch):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            account = self._lookup(key)
+            if account is not None:
+                Metrics.incr('identity.hit')
+                return account
+            Metrics.incr('identity.miss')
+            pending = self._pending.get(key)
+            isOwner = pending is None
+            if isOwner:
+                pending = self._pending[key] = Future()
+        if not isOwner:
+            return pending.result() # another thread is already fetching this account
+        try:
+            data = fetch()
+            account = Account(data["puuid"], data["name"], data["tag"], data["region"], time.time())
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._store(account)
+            del self._pending[key]
+        pending.set_result(account)
+        self._save()
+        return account
+
+    def _store(self, account):
+        old = self._byPuuid.get(account.puuid)
+        if old is not None: # name change, drop the old Riot ID
+            self._byRiotID.pop(self._riot_key(old.name, old.tag), None)
+        self._byPuuid[account.puuid] = account
+        self._byRiotID[self._riot_key(account.name, account.tag)] = account.puuid
+
+    def clear(self):
+        '''Forgets every cached account'''
+        with self._lock:
+            self._byPuuid.clear()
+            self._byRiotID.clear()
+        self._save()
+
+    def preload(self):
+        '''Reads the on-disk cache now rather than on the first lookup'''
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return # no cache yet, or unreadable
+        now = time.time()
+        for record in records:
+            try:
+                account = Account(**record)
+            except TypeError:
+                continue
+            if now - account.fetchedAt < self.ttlSec:
+                self._store(account)
+
+    def _save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            records = [asdict(account) for account in self._byPuuid.values()]
+        try:
+            directory = os.path.dirname(self.path) or '.'
+            fd, tmpPath = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(records, f)
+            os.replace(tmpPath, self.path)
+        except OSError:
+            pass # persistence is best effort
@@ -1,22 +1,142 @@
 
 
 # to get image from url:
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
 import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from PIL import Image, ImageTk
+from MatchCache import default_cache_dir
+
+
+class ImageCache:
+    """Two-tier cache for remote images.
+
+    Decoded, already-resized images are kept in an in-memory LRU keyed by
+    (url, width, height). Original bytes are kept on disk along with their
+    ETag/Last-Modified, and are revalidated with a conditional request once
+    they are older than `maxAgeSec`.
+    """
+    def __init__(self, directory=None, maxEntries=128, maxAgeSec=24 * 3600, timeout=5):
+        self.directory: str = directory if directory is not None else default_cache_dir('images')
+        self.maxEntries: int = maxEntries
+        self.maxAgeSec: float = maxAgeSec
+        self.timeout: float = timeout
+        self._images: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return base + '.bin', base + '.json'
+
+    def get_bytes(self, url) -> bytes:
+        '''Returns the original image bytes, from disk when fresh or still valid'''
+        dataPath, metaPath = self._paths(url)
+        try:
+            with open(metaPath, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(dataPath, 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError):
+            meta, data = None, None
+        if data is not None and time.time() - meta.get("fetchedAt", 0) < self.maxAgeSec:
+            return data
+        request = urllib.request.Request(url)
+        if data is not None: # revalidate what we have
+            if meta.get("etag"):
+                request.add_header('If-None-Match', meta["etag"])
+            if meta.get("lastModified"):
+                request.add_header('If-Modified-Since', meta["lastModified"])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                newData = response.read()
+                headers = response.headers
+        except OSError as e: # includes HTTPError
+            if data is None:
+                raise
+            if isinstance(e, urllib.error.HTTPError) and e.code == 304:
+                meta["fetchedAt"] = time.time()
+                self._write(metaPath, json.dumps(meta).encode('utf-8'))
+            return data # unchanged, or offline / server error: a stale image beats none
+        meta = {"url": url, "etag": headers.get('ETag'), "lastModified": headers.get('Last-Modified'), "fetchedAt": time.time()}
+        self._write(dataPath, newData)
+        self._write(metaPath, json.dumps(meta).encode('utf-8'))
+        return newData
+
+    def _write(self, path, data):
+        tmpPath = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmpPath, 'wb') as f:
+                f.write(data)
+            os.replace(tmpPath, path)
+        except OSError:
+            pass # disk cache is best effort
+
+    def get_image(self, url, width=None, height=None) -> Image.Image:
+        '''Returns the decoded (and resized, if a size is given) image.
+        The returned image is shared with the cache, so copy it before modifying.'''
+        key = (url, width, height)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+        image = Image.open(BytesIO(self.get_bytes(url)))
+        if width is not None and height is not None:
+            image.draft(None, (width, height)) # JPEG: let the decoder downscale by 1/2, 1/4 or 1/8
+            image = image.resize((width, height), Image.LANCZOS, reducing_gap=2.0) # cheap reduce() first, then LANCZOS
+        else:
+            image.load()
+        with self._lock:
+            self._images[key] = image
+            if len(self._images) > self.maxEntries:
+                self._images.popitem(last=False)
+        return image
+
+    def prefetch(self, urls, width=None, height=None, maxWorkers=8):
+        '''Warms the cache for every url in parallel, returning {url: error} for any that failed'''
+        errors = {}
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = {url: executor.submit(self.get_image, url, width, height) for url in dict.fromkeys(urls)}
+        for url, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                errors[url] = ImageFetchError(f"Failed to fetch image from {url}")
+                errors[url].__cause__ = e
+        return errors
+
+
+_imageCache: ImageCache | None = None
+_cacheLock = threading.Lock()
+
+def get_image_cache():
+    '''Returns the shared image cache, creating it on first use'''
+    global _imageCache
+    with _cacheLock:
+        if _imageCache is None:
+            _imageCache = ImageCache()
+    return _imageCache
 
 def url_to_Image(url, width=None, height=None) -> Image:
+    '''Returns a copy of the cached image, so callers can modify it freely'''
     try:
-        response = urllib.request.urlopen(url)
-        image = Image.open(BytesIO(response.read()))
+        return get_image_cache().get_image(url, width, height).copy()
     except Exception as e:
         raise ImageFetchError(f"Failed to fetch image from {url}") from e
-    response.close()
-    if width is not None and height is not None:
-        image = image.resize((width, height), Image.LANCZOS)
-    return image
+
+def prefetch_images(urls, width=None, height=None):
+    '''Fetches and decodes every url in parallel so later url_to_Image calls are instant'''
+    return get_image_cache().prefetch(urls, width, height)
 
 
 class ImageFetchError(Exception):
     """Raised when fetching an image from a URL fails."""
-    pass
\ No newline at end of file
+    pass
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import zlib
+
+
+def default_cache_dir(name):
+    '''Returns (and creates) the per-user ValTime cache directory for the given name'''
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    path = os.path.join(base, 'ValTime', name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class MatchCache:
+    """Compressed, size-bounded disk cache for finished match payloads.
+
+    Entries are named by the SHA-256 of their key and written atomically
+    (temp file + rename), so several processes can share one directory.
+    Reads refresh an entry's mtime, and eviction removes the least recently
+    used entries once the directory grows past `max_bytes`.
+    """
+    SUFFIX = '.json.z'
+    LOCK_NAME = '.evict.lock'
+    LOCK_STALE_SEC = 30
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024, offline=False):
+        self.directory: str = directory if directory is not None else default_cache_dir('matches')
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes: int = max_bytes
+        self.offline: bool = offline # only serve from cache, never hit the network
+        self._approxSize: int | None = None # lazily scanned, then tracked on put
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + self.SUFFIX)
+
+    def get(self, key) -> bytes | None:
+        '''Returns the cached payload for key, or None if it is not cached'''
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                payload = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error):
+            self._remove(path) # truncated or corrupt entry, treat as a miss
+            return None
+        try:
+            os.utime(path) # mark as recently used
+        except OSError:
+            pass
+        return payload
+
+    def put(self, key, payload: bytes):
+        '''Stores payload under key, evicting old entries if the cache is too large'''
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(payload, 6)
+        fd, tmpPath = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmpPath, path) # atomic, readers never see a partial file
+        except BaseException:
+            self._remove(tmpPath)
+            raise
+        if self._approxSize is None:
+            self._approxSize = self.size()
+        else:
+            self._approxSize += len(compressed)
+        if self._approxSize > self.max_bytes:
+            self.evict()
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def _entries(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if not filename.endswith(self.SUFFIX):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue # evicted by another process
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def size(self):
+        '''Returns the total size in bytes of all cached entries'''
+        return sum(entry[1] for entry in self._entries())
+
+    def evict(self):
+        '''Removes least recently used entries until the cache fits in max_bytes'''
+        if not self._acquire_lock():
+            return # another process is already evicting
+        try:
+            entries = self._entries()
+            total = sum(entry[1] for entry in entries)
+            target = self.max_bytes * 0.9 # leave headroom so every put doesn't evict
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+            self._approxSize = total
+        finally:
+            self._release_lock()
+
+    def clear(self):
+        '''Removes every cached entry'''
+        for _, _, path in self._entries():
+            self._remove(path)
+        self._approxSize = 0
+
+    def _acquire_lock(self):
+        lockPath = os.path.join(self.directory, self.LOCK_NAME)
+        try:
+            os.close(os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.stat(lockPath).st_mtime > self.LOCK_STALE_SEC:
+                    self._remove(lockPath) # holder died mid-eviction
+            except FileNotFoundError:
+                pass
+            return False
+
+    def _release_lock(self):
+        self._remove(os.path.join(self.directory, self.LOCK_NAME))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
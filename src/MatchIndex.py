@@ -0,0 +1,175 @@
+"""Local SQLite index of parsed matches.
+
+Stores match, player and per-round rows for every player in each match
+(from one LobbyStats parse), so history questions run against the index
+instead of refetching matches:
+
+    index = MatchIndex()
+    index.sync(puuid) # fetches only match IDs not seen before
+    index.query(puuid, map='Lotus', clutch=True)
+    index.acs_trend(puuid)
+"""
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import ValFunc as vf
+from MatchCache import default_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    map TEXT NOT NULL,
+    mode TEXT,
+    game_start INTEGER, -- unix seconds
+    rounds_played INTEGER NOT NULL,
+    red_score INTEGER NOT NULL,
+    blue_score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_matches (
+    match_id TEXT NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    puuid TEXT NOT NULL,
+    name TEXT,
+    tag TEXT,
+    team TEXT NOT NULL,
+    map TEXT NOT NULL, -- copied from matches so per-player filters use one index
+    game_start INTEGER,
+    agent TEXT NOT NULL,
+    competitive_tier INTEGER,
+    rank TEXT,
+    won INTEGER NOT NULL,
+    acs INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    assists INTEGER NOT NULL,
+    clutches INTEGER NOT NULL,
+    PRIMARY KEY (match_id, puuid)
+);
+CREATE INDEX IF NOT EXISTS player_matches_by_date ON player_matches (puuid, game_start);
+CREATE INDEX IF NOT EXISTS player_matches_by_map ON player_matches (puuid, map, game_start);
+CREATE INDEX IF NOT EXISTS player_matches_by_agent ON player_matches (puuid, agent, game_start);
+CREATE INDEX IF NOT EXISTS player_matches_by_tier ON player_matches (puuid, competitive_tier);
+CREATE TABLE IF NOT EXISTS rounds (
+    match_id TEXT NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    round INTEGER NOT NULL,
+    winning_team TEXT NOT NULL,
+    end_type TEXT NOT NULL,
+    start_time INTEGER NOT NULL, -- ms into the match
+    length INTEGER NOT NULL, -- ms
+    PRIMARY KEY (match_id, round)
+);
+CREATE TABLE IF NOT EXISTS player_rounds (
+    match_id TEXT NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    puuid TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    survived INTEGER NOT NULL,
+    clutch INTEGER NOT NULL,
+    PRIMARY KEY (match_id, puuid, round)
+);
+"""
+
+
+class MatchIndex:
+    """SQLite store of parsed matches, indexed by puuid, map, agent, rank tier and date"""
+    def __init__(self, path=None):
+        self.path: str = path if path is not None else os.path.join(default_cache_dir('index'), 'matches.sqlite3')
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL') # readers don't block a syncing process
+        self.db.execute('PRAGMA foreign_keys=ON')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def has_match(self, match_id):
+        return self.db.execute('SELECT 1 FROM matches WHERE match_id = ?', (match_id,)).fetchone() is not None
+
+    def add_match(self, match_id, data):
+        '''Parses a v2 match "data" object and stores rows for every player in it'''
+        lobby = vf.LobbyStats(match_id, data)
+        red = lobby.team_stats('Red')
+        redScore = sum(curRound.win for curRound in red.rounds)
+        metadata = data["metadata"]
+        numRounds = lobby.numRounds
+        with self.db:
+            self.db.execute('DELETE FROM matches WHERE match_id = ?', (match_id,))
+            self.db.execute('INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                match_id, lobby.map, metadata.get("mode"), metadata.get("game_start"),
+                numRounds, redScore, numRounds - redScore
+            ))
+            self.db.executemany('INSERT INTO rounds VALUES (?, ?, ?, ?, ?, ?)', [
+                (match_id, r, 'Red' if curRound.win else 'Blue', curRound.endType, curRound.startTime, curRound.length)
+                for r, curRound in enumerate(red.rounds)
+            ])
+            for p, player in enumerate(lobby.players):
+                stats = vf.build_player_stats(data, player, lobby.player_rounds(player["puuid"]))
+                start = p * numRounds
+                self.db.execute('INSERT INTO player_matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (
+                    match_id, player["puuid"], player.get("name"), player.get("tag"), player["team"],
+                    lobby.map, metadata.get("game_start"), stats.agent, stats.competitiveTier, stats.curRank,
+                    int(stats.win), stats.acs, stats.kills, stats.deaths, stats.assists,
+                    sum(lobby.clutch[start:start + numRounds])
+                ))
+                self.db.executemany('INSERT INTO player_rounds VALUES (?, ?, ?, ?, ?, ?)', [
+                    (match_id, player["puuid"], r, lobby.kills[start + r], lobby.survived[start + r], lobby.clutch[start + r])
+                    for r in range(numRounds)
+                ])
+
+    def sync(self, puuid, region=None, maxWorkers=8):
+        '''Indexes the player's recent matches, fetching only ones not already stored.
+        Returns (number of matches added, {match_id: error} for any that failed).'''
+        matchIDs = vf.list_last_matches(puuid, region=region, priority=vf.PRIORITY_BACKGROUND)
+        unseen = [matchID for matchID in dict.fromkeys(matchIDs) if not self.has_match(matchID)]
+        added = 0
+        errors = {}
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            futures = {executor.submit(vf.get_match_data, matchID, vf.PRIORITY_BACKGROUND, True): matchID for matchID in unseen}
+            for future in as_completed(futures): # sqlite writes stay on this thread
+                matchID = futures[future]
+                try:
+                    self.add_match(matchID, future.result())
+                    added += 1
+                except Exception as e:
+                    errors[matchID] = e
+        return added, errors
+
+    def query(self, puuid, map=None, agent=None, minTier=None, maxTier=None, since=None, until=None, clutch=None, won=None, limit=None):
+        '''Returns the player's indexed matches (newest first) matching every given filter.
+        since/until are unix seconds; clutch=True keeps only matches with at least one clutch.'''
+        sql = 'SELECT * FROM player_matches WHERE puuid = ?'
+        params: list = [puuid]
+        for clause, value in (
+            ('map = ?', map), ('agent = ?', agent),
+            ('competitive_tier >= ?', minTier), ('competitive_tier <= ?', maxTier),
+            ('game_start >= ?', since), ('game_start < ?', until),
+            ('won = ?', None if won is None else int(won))
+        ):
+            if value is not None:
+                sql += f' AND {clause}'
+                params.append(value)
+        if clutch is not None:
+            sql += ' AND clutches > 0' if clutch else ' AND clutches = 0'
+        sql += ' ORDER BY game_start DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def acs_trend(self, puuid, limit=None, **filters):
+        '''Returns [(game_start, acs)] oldest first, optionally limited to the latest matches'''
+        rows = self.query(puuid, limit=limit, **filters)
+        return [(row["game_start"], row["acs"]) for row in reversed(rows)]
+
+    def player_rounds(self, match_id, puuid):
+        '''Returns the stored per-round rows (kills, survived, clutch) for one player in one match'''
+        return [dict(row) for row in self.db.execute(
+            'SELECT round, kills, survived, clutch FROM player_rounds WHERE match_id = ? AND puuid = ? ORDER BY round',
+            (match_id, puuid)
+        )]
@@ -0,0 +1,266 @@
+"""Compact, versioned binary format for parsed MatchStats / PlayerMatchStats.
+
+Layout (little-endian):
+
+    header   magic b'VTMP', version, flags, counts, then (offset, length) for each column
+    columns  packed integer arrays, each 8-byte aligned, in COLUMNS order
+
+Every string (puuids, teams, end types, map, agent, rank) is stored once in
+an interned table and referenced by index. Loading memory-maps the file and
+wraps each column in a memoryview, so nothing is copied or parsed until a
+field is read; chapters() builds straight from the columns.
+"""
+import mmap
+import struct
+import sys
+from array import array
+import ValFunc as vf
+
+MAGIC = b'VTMP'
+VERSION = 1
+FLAG_PLAYER = 1 # file includes PlayerMatchStats fields
+
+# (name, array typecode), in file order. Changing this list means bumping VERSION.
+COLUMNS = [
+    ('stringOffsets', 'I'), # numStrings + 1 byte offsets into stringData
+    ('stringData', 'B'), # utf-8
+    ('roundStart', 'i'),
+    ('roundLength', 'i'),
+    ('roundEndType', 'I'), # string index
+    ('roundWin', 'b'),
+    ('roundKillStart', 'I'), # numRounds + 1 offsets into the kill columns
+    ('chapterTimes', 'i'),
+    ('killTimeInRound', 'i'),
+    ('killTimeInMatch', 'i'),
+    ('killKiller', 'H'), # string index
+    ('killKillerTeam', 'H'),
+    ('killVictim', 'H'),
+    ('killVictimTeam', 'H'),
+    ('killTeammatesLeft', 'b'),
+    ('killEnemiesLeft', 'b'),
+    ('killLeftStart', 'I'), # numKills + 1 offsets into leftPlayers
+    ('leftPlayers', 'H'), # string index
+    ('playerInfo', 'i'), # PLAYER_FIELDS, empty without FLAG_PLAYER
+    ('playerRoundKills', 'h'),
+    ('playerRoundClutch', 'b'),
+]
+PLAYER_FIELDS = ['team', 'win', 'acs', 'kills', 'deaths', 'assists', 'curRank', 'competitiveTier', 'agent']
+STRING_FIELDS = {'team', 'curRank', 'agent'}
+
+_HEADER = struct.Struct('<4sHHIII') # magic, version, flags, numRounds, numKills, map string index
+_COLUMN_ENTRY = struct.Struct('<II') # offset, byte length
+_HEADER_SIZE = _HEADER.size + _COLUMN_ENTRY.size * len(COLUMNS)
+
+
+class MatchPackError(Exception):
+    """Raised when a file is not a readable packed match."""
+    pass
+
+
+def _check_byteorder():
+    if sys.byteorder != 'little':
+        raise MatchPackError('Packed matches are only supported on little-endian machines')
+
+
+def save_match(stats, path):
+    '''Writes a MatchStats (or PlayerMatchStats) to path'''
+    _check_byteorder()
+    strings: dict[str, int] = {}
+    def intern(string):
+        index = strings.get(string)
+        if index is None:
+            index = strings[string] = len(strings)
+        return index
+
+    cols = {name: array(typecode) for name, typecode in COLUMNS}
+    mapIndex = intern(stats.map)
+    cols['roundKillStart'].append(0)
+    cols['killLeftStart'].append(0)
+    for curRound in stats.rounds:
+        cols['roundStart'].append(curRound.startTime)
+        cols['roundLength'].append(curRound.length)
+        cols['roundEndType'].append(intern(curRound.endType))
+        cols['roundWin'].append(int(curRound.win))
+        for kill in curRound.kills:
+            cols['killTimeInRound'].append(kill.timeInRound)
+            cols['killTimeInMatch'].append(kill.timeInMatch)
+            cols['killKiller'].append(intern(kill.killer_puuid))
+            cols['killKillerTeam'].append(intern(kill.killer_team))
+            cols['killVictim'].append(intern(kill.victim_puuid))
+            cols['killVictimTeam'].append(intern(kill.victim_team))
+            cols['killTeammatesLeft'].append(kill.teammatesLeft)
+            cols['killEnemiesLeft'].append(kill.enemiesLeft)
+            cols['leftPlayers'].extend(intern(puuid) for puuid in kill.playersLeft)
+            cols['killLeftStart'].append(len(cols['leftPlayers']))
+        cols['roundKillStart'].append(len(cols['killTimeInRound']))
+    cols['chapterTimes'].extend(stats.chapterTimes)
+    flags = 0
+    playerStats = getattr(stats, 'playerStats', None)
+    if playerStats is not None:
+        flags |= FLAG_PLAYER
+        for field in PLAYER_FIELDS:
+            value = stats.team if field == 'team' else getattr(playerStats, field)
+            cols['playerInfo'].append(intern(value) if field in STRING_FIELDS else int(value))
+        for playerRound in playerStats.rounds:
+            cols['playerRoundKills'].append(playerRound.numKills)
+            cols['playerRoundClutch'].append(int(playerRound.isClutch))
+    if len(strings) > 0xFFFF:
+        raise MatchPackError('Too many distinct strings for a packed match')
+    blob = bytearray()
+    for string in strings: # dicts keep insertion order, which matches the indices
+        cols['stringOffsets'].append(len(blob))
+        blob += string.encode('utf-8')
+    cols['stringOffsets'].append(len(blob))
+    cols['stringData'].frombytes(bytes(blob))
+
+    entries = []
+    body = bytearray()
+    for name, _ in COLUMNS:
+        body += b'\0' * (-(_HEADER_SIZE + len(body)) % 8) # 8-byte align every column
+        raw = cols[name].tobytes()
+        entries.append((_HEADER_SIZE + len(body), len(raw)))
+        body += raw
+    header = _HEADER.pack(MAGIC, VERSION, flags, len(stats.rounds), len(cols['killTimeInRound']), mapIndex)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for entry in entries:
+            f.write(_COLUMN_ENTRY.pack(*entry))
+        f.write(body)
+
+
+def load_match(path):
+    '''Memory-maps a file written by save_match'''
+    _check_byteorder()
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as ve: # empty file
+            raise MatchPackError(f'{path} is not a packed match') from ve
+    return PackedMatchStats(buffer)
+
+
+class PackedMatchStats(vf.PlayerMatchStats):
+    """A MatchStats/PlayerMatchStats backed by a memory-mapped packed file.
+
+    Columns are memoryviews into the mapping. `rounds` and `playerStats` are
+    only built (once) when first read; chapters() doesn't need them.
+    """
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER_SIZE:
+            raise MatchPackError('File too short for a packed match')
+        magic, version, flags, self.numRounds, self.numKills, mapIndex = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise MatchPackError('Not a packed match')
+        if version != VERSION:
+            raise MatchPackError(f'Unsupported packed match version {version}')
+        self.hasPlayer: bool = bool(flags & FLAG_PLAYER)
+        self.cols: dict[str, memoryview] = {}
+        for i, (name, typecode) in enumerate(COLUMNS):
+            offset, length = _COLUMN_ENTRY.unpack_from(view, _HEADER.size + i * _COLUMN_ENTRY.size)
+            if offset + length > len(view):
+                raise MatchPackError(f'Column {name} runs past the end of the file')
+            self.cols[name] = view[offset:offset + length].cast(typecode)
+        self._strings: dict[int, str] = {}
+        self._rounds: list[vf.RoundStats] | None = None
+        self._playerStats: vf.PlayerStats | None = None
+        self.map = self.string(mapIndex)
+
+    def close(self):
+        '''Releases the mapping; the object can't be used afterwards'''
+        for column in self.cols.values():
+            column.release()
+        self.cols = {}
+        self._buffer.close()
+
+    def string(self, index) -> str:
+        '''Returns an interned string by index, decoding it on first use'''
+        string = self._strings.get(index)
+        if string is None:
+            offsets = self.cols['stringOffsets']
+            string = self._strings[index] = bytes(self.cols['stringData'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+        return string
+
+    @property
+    def chapterTimes(self):
+        return self.cols['chapterTimes']
+
+    @property
+    def team(self):
+        return self.string(self.cols['playerInfo'][0]) if self.hasPlayer else None
+
+    def round_scores(self) -> list[str]:
+        scores = []
+        curTeamScore = oppTeamScore = 0
+        for win in self.cols['roundWin']:
+            scores.append(f'{curTeamScore} - {oppTeamScore}')
+            if win:
+                curTeamScore += 1
+            else:
+                oppTeamScore += 1
+        return scores
+
+    @property
+    def rounds(self) -> list[vf.RoundStats]:
+        if self._rounds is None:
+            c = self.cols
+            scores = self.round_scores()
+            rounds = []
+            for r in range(self.numRounds):
+                kills = []
+                for k in range(c['roundKillStart'][r], c['roundKillStart'][r + 1]):
+                    kills.append(vf.Kill(
+                        c['killTimeInRound'][k],
+                        c['killTimeInMatch'][k],
+                        self.string(c['killKiller'][k]),
+                        self.string(c['killKillerTeam'][k]),
+                        self.string(c['killVictim'][k]),
+                        self.string(c['killVictimTeam'][k]),
+                        c['killTeammatesLeft'][k],
+                        c['killEnemiesLeft'][k],
+                        tuple([self.string(i) for i in c['leftPlayers'][c['killLeftStart'][k]:c['killLeftStart'][k + 1]]])
+                    ))
+                rounds.append(vf.RoundStats(
+                    bool(c['roundWin'][r]),
+                    c['roundStart'][r],
+                    c['roundLength'][r],
+                    self.string(c['roundEndType'][r]),
+                    tuple(kills),
+                    scores[r],
+                    len(kills) > 0
+                ))
+            self._rounds = rounds
+        return self._rounds
+
+    @property
+    def playerStats(self) -> vf.PlayerStats | None:
+        if self._playerStats is None and self.hasPlayer:
+            info = dict(zip(PLAYER_FIELDS, self.cols['playerInfo']))
+            self._playerStats = vf.PlayerStats(
+                bool(info['win']),
+                info['acs'],
+                info['kills'],
+                info['deaths'],
+                info['assists'],
+                self.string(info['curRank']),
+                info['competitiveTier'],
+                self.string(info['agent']),
+                [vf.PlayerRoundStats(kills, bool(clutch)) for kills, clutch in zip(self.cols['playerRoundKills'], self.cols['playerRoundClutch'])]
+            )
+        return self._playerStats
+
+    def match_end_sec(self) -> int:
+        return round((self.cols['roundStart'][-1] + self.cols['roundLength'][-1]) / 1_000)
+
+    def chapters(self, startTimeSec=60, match=0) -> list[vf.Chapter]:
+        if not self.hasPlayer:
+            return vf.MatchStats.chapters(self, startTimeSec, match)
+        info = self.cols['playerInfo']
+        agent = self.string(info[PLAYER_FIELDS.index('agent')])
+        return self._build_chapters(
+            startTimeSec, match,
+            self.cols['playerRoundKills'],
+            [agent if isClutch else None for isClutch in self.cols['playerRoundClutch']],
+            agent, self.string(info[PLAYER_FIELDS.index('curRank')]), self.team
+        )
@@ -0,0 +1,147 @@
+"""Lightweight timing spans and counters for the fetch/parse/render hot paths.
+
+Disabled by default: span() then hands back one shared no-op context manager
+and incr() returns immediately, so instrumented code costs a function call.
+
+    Metrics.enable('valtime-metrics.jsonl') # log path is optional
+    with Metrics.span('parse.matchstats'):
+        ...
+    Metrics.incr('http.bytes', len(body))
+    print(Metrics.format_snapshot())
+"""
+import functools
+import json
+import threading
+import time
+
+enabled: bool = False
+_lock = threading.Lock()
+_counters: dict[str, float] = {}
+_spans: dict[str, list[float]] = {} # name -> [count, total sec, max sec]
+_log = None # open JSON-lines file, if exporting
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable(logPath=None):
+    '''Starts collecting; with logPath, every finished span is also appended there as a JSON line'''
+    global enabled, _log
+    with _lock:
+        if _log is not None:
+            _log.close()
+        _log = open(logPath, 'a', encoding='utf-8') if logPath is not None else None
+        enabled = True
+
+
+def disable():
+    '''Stops collecting (already collected numbers are kept until reset)'''
+    global enabled, _log
+    with _lock:
+        enabled = False
+        if _log is not None:
+            _log.close()
+            _log = None
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _spans.clear()
+
+
+def span(name):
+    '''Context manager timing the enclosed block under name'''
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def timed(name):
+    '''Decorator timing every call of the decorated function under name'''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds):
+    '''Adds one timing sample for name'''
+    if not enabled:
+        return
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            _spans[name] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            if seconds > stats[2]:
+                stats[2] = seconds
+        if _log is not None:
+            _log.write(json.dumps({"ts": time.time(), "span": name, "ms": round(seconds * 1e3, 3)}) + '\n')
+            _log.flush()
+
+
+def incr(name, amount=1):
+    '''Adds amount to the counter name'''
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot():
+    '''Returns the collected counters and span statistics as plain dicts'''
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "spans": {
+                name: {"count": count, "total_ms": total * 1e3, "mean_ms": total / count * 1e3, "max_ms": longest * 1e3}
+                for name, (count, total, longest) in _spans.items()
+            },
+        }
+
+
+def format_snapshot(snap=None):
+    '''Returns the snapshot as a small text table'''
+    if snap is None:
+        snap = snapshot()
+    lines = [f'{"span":<24} {"count":>7} {"total ms":>10} {"mean ms":>9} {"max ms":>9}']
+    for name, s in sorted(snap["spans"].items()):
+        lines.append(f'{name:<24} {s["count"]:>7} {s["total_ms"]:>10.2f} {s["mean_ms"]:>9.3f} {s["max_ms"]:>9.3f}')
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f'{name:<24} {value:>7g}')
+    return '\n'.join(lines)
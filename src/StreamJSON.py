@@ -0,0 +1,84 @@
+"""Field-selective JSON loading.
+
+A field spec says which parts of a document to keep: `True` keeps a value
+whole, a dict keeps only the listed keys of an object (each with its own
+spec), and a spec applied to an array applies to every item. Anything not
+listed is skipped while parsing, so it is never built as Python objects.
+
+Streaming uses the `ijson` package from requirements.txt (imported on first
+use). If it isn't installed, the document is parsed in full and then pruned,
+which gives the same result without the memory savings.
+"""
+import json
+
+_ijson = False # False until looked up, then the module or None if not installed
+
+
+def _get_ijson():
+    global _ijson
+    if _ijson is False:
+        try:
+            import ijson # for streaming; the fallback keeps working without it
+        except ImportError:
+            ijson = None
+        _ijson = ijson
+    return _ijson
+
+
+def load_selected(fileobj, fields):
+    '''Parses JSON from a binary file object, keeping only the fields in the spec'''
+    ijson = _get_ijson()
+    if ijson is None:
+        return prune(json.load(fileobj), fields)
+    try:
+        events = iter(ijson.basic_parse(fileobj, use_float=True))
+        event, value = next(events)
+        return _build(events, event, value, fields)
+    except (ijson.JSONError, StopIteration) as e:
+        raise ValueError(f'Invalid JSON: {e}') from e # match json.load's error type
+
+
+def prune(value, fields):
+    '''Returns a copy of an already-parsed value with only the fields in the spec'''
+    if fields is True:
+        return value
+    if isinstance(value, list):
+        return [prune(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: prune(value[key], sub) for key, sub in fields.items() if key in value}
+    return value
+
+
+def _build(events, event, value, fields):
+    if event == 'start_map':
+        obj = {}
+        for event, key in events:
+            if event == 'end_map':
+                return obj
+            sub = True if fields is True else fields.get(key) # event is 'map_key'
+            event, value = next(events)
+            if sub is None:
+                _skip(events, event)
+            else:
+                obj[key] = _build(events, event, value, sub)
+    elif event == 'start_array':
+        arr = []
+        for event, value in events:
+            if event == 'end_array':
+                return arr
+            arr.append(_build(events, event, value, fields))
+    else:
+        return value
+
+
+def _skip(events, event):
+    if event != 'start_map' and event != 'start_array':
+        return # scalar, already consumed
+    depth = 1
+    for event, _ in events:
+        if event == 'start_map' or event == 'start_array':
+            depth += 1
+        elif event == 'end_map' or event == 'end_array':
+            depth -= 1
+            if depth == 0:
+                return
@@ -1,6 +1,16 @@
 import json # parce received API data
-import requests # for API GET
+from array import array # compact per-player round matrices
+from concurrent.futures import ThreadPoolExecutor, as_completed # bulk match fetching
 from dataclasses import dataclass 
+from itertools import repeat # chapter building
+import os
+import threading
+from MatchCache import MatchCache, default_cache_dir # on-disk cache of finished matches
+from IdentityResolver import IdentityResolver, Account # memoized account lookups
+from StreamJSON import load_selected # field-selective parsing of large responses
+import Metrics # timing spans and counters
+from APIClient import APIClient, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND # pooled, rate-limited HTTP
+from ChapterTemplate import Chapter, get_format, TEAM_YOUTUBE # compiled chapter output formats
 
 
 def str_to_user_gt(string):
@@ -12,12 +22,71 @@ def str_to_user_gt(string):
     if len(strlist[1]) < 3 or len(strlist[1]) > 5:
         raise ValueError(f'Error: {strlist[1]} is not a valid tagline')
     return strlist[0], strlist[1]
+
+def str_to_sec(string):
+    '''Converts a h:mm:ss, m:ss or sss time string to seconds'''
+    time = string.rstrip().split(':')
+    for part in time:
+        if not part.isnumeric():
+            raise ValueError('Invalid time format: non-numeric input')
+    if len(time) == 3:
+        return int(time[0]) * 3600 + int(time[1]) * 60 + int(time[2])
+    elif len(time) == 2:
+        return int(time[0]) * 60 + int(time[1])
+    elif len(time) == 1:
+        return int(time[0])
+    else:
+        raise ValueError('Invalid time format: incorrect segments')
     
-def getJSON(url):
+API_BASE = os.environ.get('VALTIME_API_BASE', 'https://api.henrikdev.xyz/valorant') # overridable for local stand-ins
+
+_sharedLock = threading.Lock() # guards lazy creation of the shared objects below
+_client: 'APIClient | CoordinatorClient | None' = None
+
+def get_client():
+    '''Returns the shared API client, creating it on first use.
+    Where Unix sockets exist this goes through the local coordinator daemon when it's running (see Coordinator).'''
+    global _client
+    with _sharedLock:
+        if _client is None:
+            from Coordinator import make_client # deferred with the rest of the network stack
+            _client = make_client()
+    return _client
+
+_validators: dict[str, tuple[str | None, str | None, dict]] = {} # url -> (ETag, Last-Modified, last response)
+
+def getJSON(url, priority=PRIORITY_INTERACTIVE, fields=None, conditional=False):
+    import requests # for API GET; deferred since it's the slowest import at startup
     try:
         jsonOut = None
-        r = requests.get(url, timeout=5)
-        jsonOut = json.loads(r.text)
+        if fields is None:
+            headers = None
+            cached = _validators.get(url) if conditional else None
+            if cached is not None: # only send the body if it changed
+                headers = {}
+                if cached[0] is not None:
+                    headers['If-None-Match'] = cached[0]
+                if cached[1] is not None:
+                    headers['If-Modified-Since'] = cached[1]
+            r = get_client().get(url, priority, headers=headers)
+            if cached is not None and r.status_code == 304:
+                Metrics.incr('http.not_modified')
+                return cached[2]
+            Metrics.incr('http.bytes', len(r.content))
+            with Metrics.span('json.decode'):
+                jsonOut = json.loads(r.text)
+            etag, lastModified = r.headers.get('ETag'), r.headers.get('Last-Modified')
+            if conditional and r.ok and (etag is not None or lastModified is not None):
+                _validators[url] = (etag, lastModified, jsonOut)
+        else: # stream the body, only building the selected fields (see StreamJSON)
+            r = get_client().get(url, priority, stream=True)
+            try:
+                r.raw.decode_content = True
+                with Metrics.span('json.decode_selective'):
+                    jsonOut = load_selected(r.raw, {"status": True, "errors": True, **fields})
+                Metrics.incr('http.bytes', r.raw.tell())
+            finally:
+                r.close()
         r.raise_for_status()
     except requests.exceptions.HTTPError as he:
         if jsonOut is not None:
@@ -34,32 +103,114 @@ def getJSON(url):
         raise RequestError('Response not valid JSON') from ve
     return jsonOut
 
-def gt_to_puuid(username, tagline):
-    return getJSON(f'https://api.henrikdev.xyz/valorant/v1/account/{username}/{tagline}')["data"]["puuid"]
+_resolver: IdentityResolver | None = None
+
+def get_resolver():
+    '''Returns the shared identity resolver, creating it on first use'''
+    global _resolver
+    with _sharedLock:
+        if _resolver is None:
+            _resolver = IdentityResolver(
+                lambda username, tagline, priority: getJSON(f'{API_BASE}/v1/account/{username}/{tagline}', priority)["data"],
+                lambda puuid, priority: getJSON(f'{API_BASE}/v1/by-puuid/account/{puuid}', priority)["data"],
+                path=os.path.join(default_cache_dir('identity'), 'accounts.json')
+            )
+    return _resolver
 
-def puuid_to_gt(puuid):
-    js = getJSON(f'https://api.henrikdev.xyz/valorant/v1/by-puuid/account/{puuid}')
-    return [js["data"]["name"], js["data"]["tag"]]
+def warm_up():
+    '''Creates the shared client, resolver and cache and opens a connection to the API,
+    so the first lookup doesn't wait on imports, disk reads or the TLS handshake'''
+    get_resolver().preload()
+    get_match_cache()
+    get_client().connect(API_BASE)
 
-def get_region(puuid_or_username, tagline=None):
+def get_account(puuid_or_username, tagline=None, priority=PRIORITY_INTERACTIVE) -> Account:
     if tagline is None:
-        return getJSON(f'https://api.henrikdev.xyz/valorant/v1/by-puuid/account/{puuid_or_username}')["data"]["region"]
+        return get_resolver().by_puuid(puuid_or_username, priority)
     else:
-        return getJSON(f'https://api.henrikdev.xyz/valorant/v1/account/{puuid_or_username}/{tagline}')["data"]["region"]
+        return get_resolver().by_riot_id(puuid_or_username, tagline, priority)
+
+def gt_to_puuid(username, tagline, priority=PRIORITY_INTERACTIVE):
+    return get_account(username, tagline, priority).puuid
+
+def puuid_to_gt(puuid, priority=PRIORITY_INTERACTIVE):
+    account = get_account(puuid, priority=priority)
+    return [account.name, account.tag]
 
-def list_last_matches(puuid_or_username, tagline=None, region=None):
+def get_region(puuid_or_username, tagline=None, priority=PRIORITY_INTERACTIVE):
+    return get_account(puuid_or_username, tagline, priority).region
+
+def list_last_matches(puuid_or_username, tagline=None, region=None, priority=PRIORITY_INTERACTIVE, conditional=False):
     if tagline is None:
         if region is None:
-            region = get_region(puuid_or_username)
-        url = f'https://api.henrikdev.xyz/valorant/v1/by-puuid/mmr-history/{region}/{puuid_or_username}'
+            region = get_region(puuid_or_username, priority=priority)
+        url = f'{API_BASE}/v1/by-puuid/mmr-history/{region}/{puuid_or_username}'
     else:
         if region is None:
-            region = get_region(puuid_or_username, tagline)
-        url = f'https://api.henrikdev.xyz/valorant/v1/mmr-history/{region}/{puuid_or_username}/{tagline}'
-    return [i["match_id"] for i in getJSON(url)["data"]]
+            region = get_region(puuid_or_username, tagline, priority)
+        url = f'{API_BASE}/v1/mmr-history/{region}/{puuid_or_username}/{tagline}'
+    return [i["match_id"] for i in getJSON(url, priority, conditional=conditional)["data"]]
 
 
-@dataclass
+# Everything MatchStats and PlayerMatchStats read from a v2 match response
+MATCH_FIELDS = {"data": {
+    "metadata": True,
+    "players": {"all_players": {key: True for key in ("puuid", "name", "tag", "team", "character", "currenttier", "currenttier_patched", "stats")}},
+    "teams": True,
+    "rounds": {
+        "winning_team": True,
+        "end_type": True,
+        "plant_events": {"plant_time_in_round": True},
+        "defuse_events": {"defuse_time_in_round": True}
+    },
+    "kills": {
+        **{key: True for key in ("round", "kill_time_in_round", "kill_time_in_match", "killer_puuid", "killer_team", "victim_puuid", "victim_team")},
+        "player_locations_on_kill": {"player_puuid": True, "player_team": True}
+    }
+}}
+
+_matchCache: MatchCache | None = None
+
+def get_match_cache():
+    '''Returns the shared match cache, creating it on first use'''
+    global _matchCache
+    with _sharedLock:
+        if _matchCache is None:
+            _matchCache = MatchCache()
+    return _matchCache
+
+def set_offline(offline=True):
+    '''Only serve matches from the disk cache (no network) while offline is True'''
+    get_match_cache().offline = offline
+
+def get_match_data(match_id, priority=PRIORITY_INTERACTIVE, selective=False):
+    '''Returns the v2 match "data" object, from the disk cache when possible.
+    With selective=True, only the MATCH_FIELDS needed for stats are parsed and kept.'''
+    cache = get_match_cache()
+    payload = cache.get(match_id)
+    if payload is None and selective:
+        payload = cache.get(f'{match_id}:selective')
+    if payload is not None:
+        Metrics.incr('cache.hit')
+        with Metrics.span('cache.decode'):
+            return json.loads(payload)
+    Metrics.incr('cache.miss')
+    if cache.offline:
+        raise RequestError(f'Match {match_id} is not cached (offline mode)')
+    url = f'{API_BASE}/v2/match/{match_id}'
+    with Metrics.span('fetch.match'):
+        if selective:
+            data = getJSON(url, priority, MATCH_FIELDS)["data"]
+        else:
+            data = getJSON(url, priority)["data"]
+    try:
+        cache.put(f'{match_id}:selective' if selective else match_id, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+    except OSError:
+        pass # a full or read-only cache shouldn't fail the lookup
+    return data
+
+
+@dataclass(slots=True)
 class Kill:
     timeInRound: int
     timeInMatch: int
@@ -69,24 +220,24 @@ class Kill:
     victim_team: str
     teammatesLeft: int
     enemiesLeft: int
-    playersLeft: list[str] # player puuids
+    playersLeft: tuple[str, ...] # player puuids
 
-@dataclass
+@dataclass(slots=True)
 class RoundStats:
     win: bool # if player/team won or not
     startTime: int # in terms of matchTime (ms)
     length: int # in terms of milliseconds
     endType: str # how round ended (Eliminated, Bomb defused, Bomb detonated, Round timer expired)
-    kills: list[Kill] # kill times in milliseconds
+    kills: tuple[Kill, ...] # kill times in milliseconds
     scoreUptoRound: str # score before this round (current player first)
     isKills: bool # if any kills were made
 
-@dataclass
+@dataclass(slots=True)
 class PlayerRoundStats:
     numKills: int # kills by current player
     isClutch: bool # if player clutched
 
-@dataclass
+@dataclass(slots=True)
 class PlayerStats:
     win: bool # if player won or not
     acs: int
@@ -100,39 +251,62 @@ class PlayerStats:
 
 
 
+def group_kills_by_round(data, curTeam) -> list[list[Kill]]:
+    '''Builds every Kill in one pass over data["kills"], bucketed by round'''
+    roundsPlayed = data["metadata"]["rounds_played"]
+    roundKills: list[list[Kill]] = [[] for _ in range(roundsPlayed)]
+    Metrics.incr('parse.kills', len(data["kills"]))
+    for kill in data["kills"]:
+        i = kill["round"]
+        if not 0 <= i < roundsPlayed:
+            continue
+        locations = kill["player_locations_on_kill"]
+        playerList = tuple([playerLocation["player_puuid"] for playerLocation in locations])
+        teamLeft = 0
+        for playerLocation in locations:
+            if playerLocation["player_team"] == curTeam:
+                teamLeft += 1
+        roundKills[i].append(Kill(
+            kill["kill_time_in_round"],
+            kill["kill_time_in_match"],
+            kill["killer_puuid"],
+            kill["killer_team"],
+            kill["victim_puuid"],
+            kill["victim_team"],
+            teamLeft,
+            len(locations) - teamLeft,
+            playerList
+        ))
+    return roundKills
+
+
+def build_player_stats(data, player, playerRoundsStats) -> PlayerStats:
+    '''Builds PlayerStats from a player's entry in data["players"]["all_players"]'''
+    return PlayerStats(
+        data["teams"][player["team"].lower()]["has_won"],
+        round(player["stats"]["score"] / data["metadata"]["rounds_played"]),
+        player["stats"]["kills"],
+        player["stats"]["deaths"],
+        player["stats"]["assists"],
+        player["currenttier_patched"],
+        player["currenttier"],
+        player["character"],
+        playerRoundsStats
+    )
+
+
 class MatchStats:
+    @Metrics.timed('parse.matchstats')
     def __init__(self, data, curTeam):
         self.map: str = data["metadata"]["map"]
         self.rounds: list[RoundStats] = []
         self.chapterTimes: list[int] = []
         curTeamScore = 0
         oppTeamScore = 0
+        roundKillsList = group_kills_by_round(data, curTeam)
         for i in range(data["metadata"]["rounds_played"]):
-            round_kills: list[Kill] = []
+            round_kills = roundKillsList[i]
             curRound = data["rounds"][i]
-            # GET round kills
-            for kill in data["kills"]:
-                if kill["round"] == i:
-                    teamLeft = 0
-                    enemLeft = 0
-                    playerList = []
-                    for playerLocation in kill["player_locations_on_kill"]:
-                        if playerLocation["player_team"] == curTeam:
-                            teamLeft += 1
-                        else:
-                            enemLeft += 1
-                        playerList.append(playerLocation["player_puuid"])
-                    round_kills.append(Kill(
-                        kill["kill_time_in_round"],
-                        kill["kill_time_in_match"],
-                        kill["killer_puuid"],
-                        kill["killer_team"],
-                        kill["victim_puuid"],
-                        kill["victim_team"],
-                        teamLeft,
-                        enemLeft,
-                        playerList
-                    ))
             round_isKills = len(round_kills) > 0
             # GET end type
             round_endType = curRound["end_type"]
@@ -168,7 +342,7 @@ class MatchStats:
                 round_startTime,
                 round_length,
                 round_endType,
-                round_kills,
+                tuple(round_kills),
                 round_scoreUptoRound,
                 round_isKills
             ))
@@ -178,39 +352,63 @@ class MatchStats:
             else:
                 self.chapterTimes.append(round(round_startTime / 1_000) - 30)
     
-    def get_chapters(self, startTimeSec=60, title=None, postfixList=None):
-        output = ''
-        if title is not None:
-            output += f'{title}\n'
-        for i in range(len(self.rounds)):
-            curRound = self.rounds[i]
-            sec = startTimeSec - 45 + self.chapterTimes[i] - self.chapterTimes[0]
-            if i == 12:
-                sec -= 15
-            if sec < 0:
-                sec = -sec
-                isNegative = True
-            else:
-                isNegative = False
-            hr = sec // 3600
-            min = (sec // 60) % 60
-            sec %= 60
-            if isNegative:
-                output += '-'
-            if hr == 0:
-                output += f'{min}'
-            else:
-                output += f'{hr}:{min:02d}'
-            output += f':{sec:02d} Round {i+1} | {curRound.scoreUptoRound}'
-            if postfixList is not None:
-                output += f' | {postfixList[i]}'
-            output += '\n'
-        return output
+    def round_scores(self) -> list[str]:
+        '''Returns the score before each round (current team first)'''
+        return [curRound.scoreUptoRound for curRound in self.rounds]
+    
+    def save(self, path):
+        '''Writes the parsed stats to path in the compact binary format (see MatchPack)'''
+        import MatchPack # imported here, MatchPack depends on this module
+        MatchPack.save_match(self, path)
+    
+    @staticmethod
+    def load(path):
+        '''Memory-maps stats written by save(), returning a MatchPack.PackedMatchStats'''
+        import MatchPack
+        return MatchPack.load_match(path)
+    
+    def match_end_sec(self) -> int:
+        '''Returns when the last round ended, in seconds of match time'''
+        lastRound = self.rounds[-1]
+        return round((lastRound.startTime + lastRound.length) / 1_000)
+    
+    def chapters(self, startTimeSec=60, match=0) -> list[Chapter]:
+        '''Returns one Chapter per round, placed on the VOD by startTimeSec (the end of the 1st pre-round)'''
+        return self._build_chapters(startTimeSec, match)
+    
+    def _build_chapters(self, startTimeSec, match, kills=None, clutchers=None, agent=None, rank=None, team=None):
+        # kills and clutchers (agent(s) who clutched, or None) are per round
+        chapterTimes = self.chapterTimes
+        if len(chapterTimes) == 0:
+            return []
+        offset = startTimeSec - 45 - chapterTimes[0]
+        starts = [offset + chapterTime for chapterTime in chapterTimes]
+        if len(starts) > 12:
+            starts[12] -= 15 # longer buy phase after halftime
+        ends = starts[1:]
+        ends.append(offset + self.match_end_sec())
+        if kills is None:
+            kills = repeat(None)
+        clutchers = list(clutchers) if clutchers is not None else [None] * len(starts)
+        # map() builds the Chapters without a Python-level loop; it stops at the shortest argument
+        return list(map(
+            Chapter, range(1, len(starts) + 1), starts, ends, self.round_scores(),
+            repeat(self.map), repeat(match), repeat(team), repeat(agent), repeat(rank),
+            kills, map(bool, clutchers), clutchers
+        ))
+    
+    @Metrics.timed('render.chapters')
+    def get_chapters(self, startTimeSec=60, *, template=None):
+        '''Renders the chapters with a format name ('youtube', 'ffmpeg', 'vtt', 'json'), a line template or
+        a compiled ChapterTemplate (see ChapterTemplate); YouTube description text by default.
+        template is keyword-only so calls using the old (startTimeSec, title, postfixList) order fail loudly.'''
+        return get_format(template).render(self.chapters(startTimeSec))
 
 
 class PlayerMatchStats(MatchStats):
-    def __init__(self, match_id, player_puuid):
-        data = getJSON(f'https://api.henrikdev.xyz/valorant/v2/match/{match_id}')["data"]
+    def __init__(self, match_id, player_puuid, data=None):
+        if data is None: # pass data to parse an already-fetched match
+            data = get_match_data(match_id)
         player = None
         for player_data in data["players"]["all_players"]:
             if player_data["puuid"] == player_puuid:
@@ -220,6 +418,12 @@ class PlayerMatchStats(MatchStats):
             raise ValueError(f"Selected player not found in given match ID")
         self.team: str = player["team"]
         super().__init__(data, self.team)
+        playerRoundsStats = self._player_rounds(player_puuid)
+        self.playerStats = build_player_stats(data, player, playerRoundsStats)
+    
+    @Metrics.timed('parse.clutch')
+    def _player_rounds(self, player_puuid) -> list[PlayerRoundStats]:
+        '''Counts the player's kills and detects clutches in every round'''
         playerRoundsStats: list[PlayerRoundStats] = []
         for curRound in self.rounds:
             playerKills = 0
@@ -227,12 +431,7 @@ class PlayerMatchStats(MatchStats):
             for kill in curRound.kills:
                 if kill.killer_puuid == player_puuid and kill.victim_team != self.team:
                     playerKills += 1
-                isPlayerAlive = False
-                for puuid in kill.playersLeft:
-                    if puuid == player_puuid:
-                        isPlayerAlive = True
-                        break
-                if isPlayerAlive and kill.teammatesLeft == 1 and kill.enemiesLeft > 1 and not playerClutchPos:
+                if not playerClutchPos and kill.teammatesLeft == 1 and kill.enemiesLeft > 1 and player_puuid in kill.playersLeft:
                     playerClutchPos = True
                     playerClutchPosTime = kill.timeInRound
             if playerClutchPos and curRound.win and playerClutchPosTime < curRound.length:
@@ -243,27 +442,203 @@ class PlayerMatchStats(MatchStats):
                 playerKills,
                 isClutch
             ))
-        self.playerStats = PlayerStats(
-            data["teams"][self.team.lower()]["has_won"],
-            round(player["stats"]["score"] / data["metadata"]["rounds_played"]),
-            player["stats"]["kills"],
-            player["stats"]["deaths"],
-            player["stats"]["assists"],
-            player["currenttier_patched"],
-            player["currenttier"],
-            player["character"],
-            playerRoundsStats
-        )
+        return playerRoundsStats
     
-    def get_chapters(self, startTimeSec=60):
-        title = f'{self.playerStats.agent} {self.map} {self.playerStats.curRank}'
-        lineList: list[str] = []
-        for round in self.playerStats.rounds:
-            line = f'{round.numKills}k'
-            if round.isClutch:
-                line += ' | CLUTCH'
-            lineList.append(line)
-        return super().get_chapters(startTimeSec, title, lineList)
+    def chapters(self, startTimeSec=60, match=0) -> list[Chapter]:
+        '''Returns one Chapter per round with the player's kills, clutches, agent and rank'''
+        agent = self.playerStats.agent
+        return self._build_chapters(
+            startTimeSec, match,
+            [playerRound.numKills for playerRound in self.playerStats.rounds],
+            [agent if playerRound.isClutch else None for playerRound in self.playerStats.rounds],
+            agent, self.playerStats.curRank, self.team
+        )
+
+
+MATCH_GAP_SEC = 180 # assumed queue + agent select + loading between matches, when game_start is missing
+
+class MultiMatchStats:
+    """Several consecutive matches from one VOD, placed on a single timeline.
+
+    Only the first match needs an anchor (the end of its 1st pre-round, as
+    for PlayerMatchStats). Every later match is offset from the previous one
+    by the difference in metadata.game_start, and lands where its own first
+    round started; without a game_start it is assumed to follow the
+    previous match's last round after MATCH_GAP_SEC.
+    """
+    def __init__(self, match_ids, player_puuid, datas=None, maxWorkers=8, priority=PRIORITY_INTERACTIVE):
+        if datas is None: # pass datas (in match_ids order) to parse already-fetched matches
+            match_ids = list(match_ids)
+            if not match_ids:
+                raise ValueError('No match IDs given')
+            with ThreadPoolExecutor(max_workers=min(maxWorkers, len(match_ids)), thread_name_prefix='match-fetch') as executor:
+                datas = list(executor.map(lambda match_id: get_match_data(match_id, priority, True), match_ids))
+        elif match_ids is None:
+            match_ids = [None] * len(datas)
+        self.match_ids: list[str | None] = list(match_ids)
+        self.matches: list[PlayerMatchStats] = [PlayerMatchStats(match_id, player_puuid, data) for match_id, data in zip(self.match_ids, datas)]
+        self.offsets: list[int] = self._place([data["metadata"].get("game_start") for data in datas])
+
+    def _place(self, gameStarts):
+        '''Returns each match's start (end of its 1st pre-round) in seconds after the first match's'''
+        offsets: list[int] = []
+        origin = 0 # VOD time of the current match's time 0, relative to the first match's anchor
+        for i, stats in enumerate(self.matches):
+            firstRound = stats.chapterTimes[0] + 45 # seconds into the match, see MatchStats.get_chapters
+            if i == 0:
+                origin = -firstRound
+            else:
+                prev = self.matches[i-1]
+                prevEnd = origin + round((prev.rounds[-1].startTime + prev.rounds[-1].length) / 1_000)
+                if gameStarts[i] is not None and gameStarts[i-1] is not None:
+                    origin += gameStarts[i] - gameStarts[i-1]
+                else:
+                    origin = prevEnd + MATCH_GAP_SEC
+                if origin + firstRound < prevEnd:
+                    raise ValueError(f'Match {i+1} starts before match {i} ends; list the matches in VOD order')
+            offsets.append(origin + firstRound)
+        return offsets
+
+    def chapters(self, startTimeSec=60) -> list[Chapter]:
+        '''Returns every match's Chapters on the one VOD timeline, startTimeSec being the first match's anchor'''
+        chapters: list[Chapter] = []
+        for i, (stats, offset) in enumerate(zip(self.matches, self.offsets)):
+            chapters.extend(stats.chapters(startTimeSec + offset, i))
+        return chapters
+
+    def get_chapters(self, startTimeSec=60, *, template=None):
+        '''Renders the merged chapters (see MatchStats.get_chapters for template)'''
+        return get_format(template).render(self.chapters(startTimeSec))
+
+
+class LobbyStats:
+    """Every player's per-round stats from a single parse of a match.
+
+    Kills, survival and clutch results are stored as flat players x rounds
+    arrays (index `player * numRounds + round`), filled in one pass over the
+    kills. Player and team chapters are cheap views over those arrays, so a
+    whole lobby needs one fetch and one parse instead of one per player.
+    """
+    def __init__(self, match_id, data=None):
+        if data is None: # pass data to parse an already-fetched match
+            data = get_match_data(match_id)
+        self.data = data
+        self.players: list[dict] = data["players"]["all_players"]
+        self.playerIndex: dict[str, int] = {player["puuid"]: i for i, player in enumerate(self.players)}
+        self.numRounds: int = data["metadata"]["rounds_played"]
+        self._teamStats: dict[str, MatchStats] = {}
+        self._compute()
+
+    @property
+    def map(self):
+        return self.data["metadata"]["map"]
+
+    def team_stats(self, team) -> MatchStats:
+        '''Returns the MatchStats (scores and wins) from the given team's side'''
+        stats = self._teamStats.get(team)
+        if stats is None:
+            stats = self._teamStats[team] = MatchStats(self.data, team)
+        return stats
+
+    @Metrics.timed('parse.lobby')
+    def _compute(self):
+        numRounds = self.numRounds
+        size = len(self.players) * numRounds
+        self.kills = array('h', [0]) * size # kills of enemies
+        self.survived = array('b', [1]) * size # 0 if the player died that round
+        self.clutchTime = array('i', [-1]) * size # time in round the player was left alone vs 2+, or -1
+        self.clutch = array('b', [0]) * size # 1 if that 1vX was won
+        teamOf = [player["team"] for player in self.players]
+        refTeam = 'Red'
+        refRounds = self.team_stats(refTeam).rounds # Kill counts are relative to refTeam
+        for r, curRound in enumerate(refRounds):
+            for kill in curRound.kills:
+                killer = self.playerIndex.get(kill.killer_puuid)
+                if killer is not None and kill.victim_team != teamOf[killer]:
+                    self.kills[killer * numRounds + r] += 1
+                victim = self.playerIndex.get(kill.victim_puuid)
+                if victim is not None:
+                    self.survived[victim * numRounds + r] = 0
+                if kill.teammatesLeft == 1 and kill.enemiesLeft > 1:
+                    lone = self._last_alive(kill.playersLeft, refTeam, teamOf, True)
+                elif kill.enemiesLeft == 1 and kill.teammatesLeft > 1:
+                    lone = self._last_alive(kill.playersLeft, refTeam, teamOf, False)
+                else:
+                    continue
+                if lone is not None and self.clutchTime[lone * numRounds + r] == -1:
+                    self.clutchTime[lone * numRounds + r] = kill.timeInRound
+        for p in range(len(self.players)):
+            won = teamOf[p] == refTeam
+            for r, curRound in enumerate(refRounds):
+                posTime = self.clutchTime[p * numRounds + r]
+                if posTime != -1 and curRound.win == won and posTime < curRound.length:
+                    self.clutch[p * numRounds + r] = 1
+
+    def _last_alive(self, playersLeft, refTeam, teamOf, onRefTeam):
+        for puuid in playersLeft:
+            i = self.playerIndex.get(puuid)
+            if i is not None and (teamOf[i] == refTeam) == onRefTeam:
+                return i
+        return None
+
+    def player_rounds(self, puuid) -> list[PlayerRoundStats]:
+        '''Returns the player's kills and clutch result for every round'''
+        start = self.playerIndex[puuid] * self.numRounds
+        return [PlayerRoundStats(self.kills[start + r], bool(self.clutch[start + r])) for r in range(self.numRounds)]
+
+    def player_view(self, puuid) -> PlayerMatchStats:
+        '''Returns the PlayerMatchStats for any player in the lobby without reparsing'''
+        if puuid not in self.playerIndex:
+            raise ValueError(f"Selected player not found in given match ID")
+        player = self.players[self.playerIndex[puuid]]
+        stats = PlayerMatchStats.__new__(PlayerMatchStats)
+        stats.__dict__.update(self.team_stats(player["team"]).__dict__) # map, rounds, chapterTimes
+        stats.team = player["team"]
+        stats.playerStats = build_player_stats(self.data, player, self.player_rounds(puuid))
+        return stats
+
+    def team_chapters(self, team, startTimeSec=60) -> list[Chapter]:
+        '''Chapters from one team's side: team kills per round and who clutched'''
+        members = [i for i, player in enumerate(self.players) if player["team"] == team]
+        kills: list[int] = []
+        clutchers: list[str | None] = []
+        for r in range(self.numRounds):
+            kills.append(sum(self.kills[i * self.numRounds + r] for i in members))
+            agents = [self.players[i]["character"] for i in members if self.clutch[i * self.numRounds + r]]
+            clutchers.append(', '.join(agents) if agents else None)
+        return self.team_stats(team)._build_chapters(startTimeSec, 0, kills, clutchers, team=team)
+
+    def get_team_chapters(self, team, startTimeSec=60, *, template=None):
+        '''Renders team_chapters, by default as YouTube text titled with the team and map'''
+        return get_format(template or TEAM_YOUTUBE).render(self.team_chapters(team, startTimeSec))
+
+
+@dataclass
+class MatchResult:
+    match_id: str
+    stats: PlayerMatchStats | None # None if the fetch or parse failed
+    error: Exception | None
+
+def fetch_matches(match_ids, player_puuid, maxWorkers=20, priority=PRIORITY_BACKGROUND, selective=True):
+    '''Fetches matches concurrently and yields a MatchResult for each as it completes.
+
+    Downloads run on a bounded thread pool (throttled by the shared client's
+    rate limit) while finished downloads are parsed in the calling thread.
+    A failed match is reported in its MatchResult instead of ending the batch.
+    '''
+    executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix='match-fetch')
+    try:
+        futures = {executor.submit(get_match_data, match_id, priority, selective): match_id for match_id in dict.fromkeys(match_ids)}
+        for future in as_completed(futures):
+            match_id = futures[future]
+            try:
+                stats = PlayerMatchStats(match_id, player_puuid, future.result())
+            except Exception as e:
+                yield MatchResult(match_id, None, e)
+            else:
+                yield MatchResult(match_id, stats, None)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True) # caller may stop iterating early
 
 
 class APIError(Exception):
@@ -0,0 +1,187 @@
+"""Watches players and generates chapters for each new match automatically.
+
+    python Watcher.py "name#TAG" "other#TAG" --out-dir chapters/
+
+Each player's mmr-history is polled on its own adaptive interval: reset to
+the minimum when a new match shows up, stretched toward the maximum while
+nothing changes. Polls use conditional requests, and the interval floor
+grows with the number of players so total polling stays under a
+requests-per-minute budget. A match shared by several watched players is
+fetched and parsed once (LobbyStats) and rendered for each of them.
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+import ValFunc as vf
+
+
+class MatchWatcher:
+    """Polls a set of puuids and renders chapters for matches not seen before"""
+    def __init__(self, puuids=(), onChapters=None, outDir=None, startTimeSec=60,
+                 minIntervalSec=60, maxIntervalSec=900, backoff=1.5, budgetPerMin=20, seenPath=None, maxFailures=3):
+        self.onChapters = onChapters # (puuid, match_id, chapters, PlayerMatchStats) -> None
+        self.outDir: str | None = outDir
+        self.startTimeSec: int = startTimeSec
+        self.minIntervalSec: float = minIntervalSec
+        self.maxIntervalSec: float = maxIntervalSec
+        self.backoff: float = backoff
+        self.budgetPerMin: float = budgetPerMin # mmr-history polls per minute across all players
+        self.seenPath: str | None = seenPath
+        self.maxFailures: int = maxFailures # attempts before a match that can't be handled is skipped
+        self.seen: dict[str, set[str]] = {} # puuid -> match IDs already handled
+        self.failures: dict[tuple[str, str], int] = {} # (puuid, match ID) -> failed attempts so far
+        self.intervals: dict[str, float] = {}
+        self._schedule: list[tuple[float, str]] = [] # heap of (next poll time, puuid)
+        self._lock = threading.Lock()
+        self._load_seen()
+        for puuid in puuids:
+            self.add(puuid)
+
+    def add(self, puuid):
+        '''Starts watching a player; matches already in their history are not chaptered'''
+        with self._lock:
+            if puuid in self.intervals:
+                return
+            self.intervals[puuid] = self.minIntervalSec
+            heapq.heappush(self._schedule, (time.monotonic(), puuid))
+
+    def remove(self, puuid):
+        with self._lock:
+            self.intervals.pop(puuid, None) # its schedule entry is dropped when it comes up
+
+    def _floor_sec(self):
+        return max(self.minIntervalSec, len(self.intervals) * 60 / self.budgetPerMin)
+
+    def poll(self, puuid):
+        '''Checks one player for new matches, handling any it finds. Returns the new match IDs.'''
+        matchIDs = vf.list_last_matches(puuid, priority=vf.PRIORITY_BACKGROUND, conditional=True)
+        if puuid not in self.seen: # first look: only remember what's already there
+            self.seen[puuid] = set(matchIDs)
+            self._save_seen()
+            return []
+        newIDs = [matchID for matchID in matchIDs if matchID not in self.seen[puuid]]
+        for matchID in newIDs:
+            try:
+                self._handle_match(matchID)
+            except Exception as e: # one bad match mustn't hold up the ones after it
+                failures = self.failures.get((puuid, matchID), 0) + 1
+                print(f'Match {matchID} failed ({failures}/{self.maxFailures}): {e!r}', file=sys.stderr)
+                if failures < self.maxFailures:
+                    self.failures[(puuid, matchID)] = failures
+                else: # give up on it for this player
+                    self.failures.pop((puuid, matchID), None)
+                    self.seen[puuid].add(matchID)
+                    self._save_seen()
+            else:
+                self.failures.pop((puuid, matchID), None)
+        return newIDs
+
+    def _handle_match(self, matchID):
+        data = vf.get_match_data(matchID, vf.PRIORITY_BACKGROUND, True)
+        lobby = vf.LobbyStats(matchID, data)
+        for puuid in list(self.intervals): # every watched player in this lobby, from one fetch
+            if puuid not in lobby.playerIndex or puuid not in self.seen or matchID in self.seen[puuid]:
+                continue # not in it, no baseline yet (their first poll decides what's new), or already done
+            stats = lobby.player_view(puuid)
+            chapters = stats.get_chapters(self.startTimeSec)
+            if self.outDir is not None:
+                player = lobby.players[lobby.playerIndex[puuid]]
+                os.makedirs(self.outDir, exist_ok=True)
+                with open(os.path.join(self.outDir, f'{player["name"]}_{player["tag"]}_{matchID}.txt'), 'w', encoding='utf-8') as f:
+                    f.write(chapters)
+            if self.onChapters is not None:
+                self.onChapters(puuid, matchID, chapters, stats)
+            self.seen[puuid].add(matchID)
+        self._save_seen()
+
+    def run(self, stopEvent=None):
+        '''Polls until stopEvent is set, sleeping until the next player is due'''
+        stopEvent = stopEvent or threading.Event()
+        while not stopEvent.is_set():
+            with self._lock:
+                if not self._schedule:
+                    due, puuid = None, None
+                else:
+                    due, puuid = self._schedule[0]
+            if puuid is None:
+                stopEvent.wait(1)
+                continue
+            wait = due - time.monotonic()
+            if wait > 0:
+                stopEvent.wait(min(wait, 5)) # wake up now and then so stopEvent/add() are noticed
+                continue
+            with self._lock:
+                heapq.heappop(self._schedule)
+                if puuid not in self.intervals:
+                    continue # removed
+            try:
+                newIDs = self.poll(puuid)
+            except Exception as e: # keep watching everyone else
+                print(f'Poll failed for {puuid}: {e!r}', file=sys.stderr)
+                newIDs = []
+            with self._lock:
+                if puuid not in self.intervals:
+                    continue
+                if newIDs:
+                    interval = self.minIntervalSec # just played, likely to queue again
+                else:
+                    interval = min(self.maxIntervalSec, self.intervals[puuid] * self.backoff)
+                self.intervals[puuid] = interval
+                heapq.heappush(self._schedule, (time.monotonic() + max(interval, self._floor_sec()), puuid))
+
+    def _load_seen(self):
+        if self.seenPath is None:
+            return
+        try:
+            with open(self.seenPath, encoding='utf-8') as f:
+                self.seen = {puuid: set(matchIDs) for puuid, matchIDs in json.load(f).items()}
+        except (OSError, ValueError):
+            pass
+
+    def _save_seen(self):
+        if self.seenPath is None:
+            return
+        tmpPath = f'{self.seenPath}.tmp'
+        with open(tmpPath, 'w', encoding='utf-8') as f:
+            json.dump({puuid: sorted(matchIDs) for puuid, matchIDs in self.seen.items()}, f)
+        os.replace(tmpPath, self.seenPath)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate chapters for new matches of the given players.')
+    parser.add_argument('players', nargs='+', help='Riot IDs (name#TAG) or puuids to watch')
+    parser.add_argument('-o', '--out-dir', help='write chapters here (default: print to stdout)')
+    parser.add_argument('--start-time', default='60', help='VOD start time used for every match (h:mm:ss / m:ss / sss)')
+    parser.add_argument('--min-interval', type=float, default=60, help='seconds between polls right after a match')
+    parser.add_argument('--max-interval', type=float, default=900, help='longest wait between polls while idle')
+    parser.add_argument('--seen-file', help='remember handled matches here across restarts')
+    args = parser.parse_args(argv)
+
+    puuids = []
+    for player in args.players:
+        if '#' in player:
+            puuids.append(vf.gt_to_puuid(*vf.str_to_user_gt(player)))
+        else:
+            puuids.append(player)
+
+    def onChapters(puuid, matchID, chapters, stats):
+        if args.out_dir is None:
+            print(f'# {puuid} {matchID}\n{chapters}', flush=True)
+        else:
+            print(f'New match {matchID} for {puuid}', flush=True)
+
+    watcher = MatchWatcher(puuids, onChapters, args.out_dir, vf.str_to_sec(args.start_time),
+                           args.min_interval, args.max_interval, seenPath=args.seen_file)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
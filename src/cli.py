@@ -0,0 +1,201 @@
+"""Headless chapter generation for many VODs at once.
+
+Reads a CSV or JSONL manifest with one row per VOD:
+
+    riot_id (username#TAG) or puuid, match_id, start_time (h:mm:ss / m:ss / sss)
+
+A VOD with several consecutive matches lists all of their IDs, in order and
+separated by spaces or semicolons (a list in JSONL), in one match_id; its
+start_time anchors the first match and the rest are placed from their
+start times (see ValFunc.MultiMatchStats).
+
+Riot IDs are resolved once each, matches are downloaded concurrently, and
+parsing/rendering runs in a process pool.
+
+    python cli.py manifest.csv [--out-dir DIR] [--workers N] [--format youtube|ffmpeg|vtt|json]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+import ValFunc as vf
+from ChapterTemplate import FORMATS, TemplateError, get_format
+
+
+@dataclass
+class ManifestRow:
+    line: int # row number in the manifest, for error messages
+    riotID: str | None
+    puuid: str | None
+    matchIDs: list[str] # more than one for a VOD of consecutive matches
+    startTime: int # seconds
+    name: str | None # output file name, if given
+    error: Exception | None = None # reported for this row only, see run
+
+
+def read_manifest(path) -> list[ManifestRow]:
+    '''Reads a .csv (with a header row) or .jsonl manifest'''
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = list(csv.DictReader(f))
+    rows: list[ManifestRow] = []
+    for i, record in enumerate(records, start=1):
+        record = {
+            key.strip().lower(): ' '.join(map(str, value)) if isinstance(value, list) else str(value).strip()
+            for key, value in record.items() if key and value is not None
+        }
+        if not record.get("match_id"):
+            raise ValueError(f'Row {i}: missing match_id')
+        if not record.get("riot_id") and not record.get("puuid"):
+            raise ValueError(f'Row {i}: needs riot_id or puuid')
+        error = None
+        try:
+            startTime = vf.str_to_sec(record["start_time"]) if record.get("start_time") else 60
+        except ValueError as e:
+            startTime, error = 60, ValueError(f'start_time {record["start_time"]!r}: {e}')
+        rows.append(ManifestRow(
+            i,
+            record.get("riot_id") or None,
+            record.get("puuid") or None,
+            record["match_id"].replace(';', ' ').split(),
+            startTime,
+            record.get("name") or None,
+            error
+        ))
+    return rows
+
+
+def resolve_riot_id(riotID):
+    '''Thread pool worker: a malformed Riot ID fails like a failed lookup, only for its own rows'''
+    return vf.gt_to_puuid(*vf.str_to_user_gt(riotID))
+
+
+def resolve_identities(rows, maxWorkers=8):
+    '''Fills in each row's puuid, looking every distinct Riot ID up only once'''
+    riotIDs = {row.riotID for row in rows if row.puuid is None}
+    with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        futures = {executor.submit(resolve_riot_id, riotID): riotID for riotID in riotIDs}
+        resolved = {}
+        for future in as_completed(futures):
+            try:
+                resolved[futures[future]] = future.result()
+            except Exception as e:
+                resolved[futures[future]] = e
+    errors = {}
+    for row in rows:
+        if row.puuid is None:
+            result = resolved[row.riotID]
+            if isinstance(result, Exception):
+                errors[row.line] = result
+            else:
+                row.puuid = result
+    return errors
+
+
+def render_chapters(datas, puuid, startTime, template=None):
+    '''Process pool worker: parses a VOD's match(es) and renders its chapters.
+    template is a format name or template string, compiled once per worker (see ChapterTemplate).'''
+    if len(datas) == 1:
+        return vf.PlayerMatchStats(None, puuid, datas[0]).get_chapters(startTime, template=template)
+    return vf.MultiMatchStats(None, puuid, datas).get_chapters(startTime, template=template)
+
+
+def run(rows, emit, workers=None, fetchWorkers=20, template=None):
+    '''Fetches, parses and renders every row, calling emit(row, chapters, error) as each finishes'''
+    for row in rows:
+        if row.error is not None:
+            emit(row, None, row.error)
+    rows = [row for row in rows if row.error is None]
+    errors = resolve_identities(rows)
+    for row in rows:
+        if row.line in errors:
+            emit(row, None, errors[row.line])
+    rows = [row for row in rows if row.line not in errors]
+    byMatch: dict[str, list[ManifestRow]] = {}
+    for row in rows:
+        for matchID in dict.fromkeys(row.matchIDs):
+            byMatch.setdefault(matchID, []).append(row)
+    fetched: dict[str, dict] = {}
+    failedLines: set[int] = set()
+    with ThreadPoolExecutor(max_workers=fetchWorkers) as fetchPool, ProcessPoolExecutor(max_workers=workers) as parsePool:
+        fetches = {fetchPool.submit(vf.get_match_data, matchID, vf.PRIORITY_BACKGROUND, True): matchID for matchID in byMatch}
+        renders = {}
+        for future in as_completed(fetches):
+            matchID = fetches[future]
+            try:
+                fetched[matchID] = future.result()
+            except Exception as e:
+                for row in byMatch[matchID]:
+                    if row.line not in failedLines:
+                        failedLines.add(row.line)
+                        emit(row, None, e)
+                continue
+            for row in byMatch[matchID]: # render once the row's last match is in
+                if row.line not in failedLines and all(m in fetched for m in row.matchIDs):
+                    datas = [fetched[m] for m in row.matchIDs]
+                    renders[parsePool.submit(render_chapters, datas, row.puuid, row.startTime, template)] = row
+        for future in as_completed(renders):
+            try:
+                emit(renders[future], future.result(), None)
+            except Exception as e:
+                emit(renders[future], None, e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate VOD chapters for every row of a manifest.')
+    parser.add_argument('manifest', help='CSV or JSONL file with riot_id/puuid, match_id and start_time columns')
+    parser.add_argument('-o', '--out-dir', help='write one file per row here instead of printing to stdout')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='parse/render processes (default: CPU count)')
+    parser.add_argument('-f', '--format', default='youtube', choices=sorted(FORMATS), help='output format (default: youtube)')
+    parser.add_argument('--template', help='custom line template for YouTube-style text, e.g. "{time} {map} R{round} {kills}k"')
+    parser.add_argument('--fetch-workers', type=int, default=20, help='concurrent match downloads')
+    parser.add_argument('--offline', action='store_true', help='only use matches already in the disk cache')
+    parser.add_argument('--stats', action='store_true', help='print timing spans and counters to stderr when done')
+    parser.add_argument('--metrics-log', help='append every timing span to this JSON-lines file')
+    args = parser.parse_args(argv)
+
+    if args.offline:
+        vf.set_offline()
+    if args.stats or args.metrics_log:
+        vf.Metrics.enable(args.metrics_log)
+    try:
+        rows = read_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+    template = args.template or args.format
+    try:
+        extension = get_format(template).extension # also checks a custom template before any work
+    except TemplateError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        return 2
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    failed = 0
+
+    def emit(row, chapters, error):
+        nonlocal failed
+        if error is not None:
+            failed += 1
+            print(f'Row {row.line} ({" ".join(row.matchIDs)}): {error}', file=sys.stderr)
+        elif args.out_dir:
+            name = row.name or f'{row.line:03d}_{row.matchIDs[0]}'
+            with open(os.path.join(args.out_dir, f'{name}.{extension}'), 'w', encoding='utf-8') as f:
+                f.write(chapters)
+        else:
+            print(f'# Row {row.line}: {row.riotID or row.puuid} {" ".join(row.matchIDs)}')
+            print(chapters)
+
+    run(rows, emit, args.workers, args.fetch_workers, template)
+    if args.stats:
+        print(vf.Metrics.format_snapshot(), file=sys.stderr) # parse/render spans run in the worker processes
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,45 +1,153 @@
-import ValFunc as vf
-# import ImgageOpenURL
+import time
+_startTime = time.perf_counter() # for measuring time to first paint
+import argparse
+import queue
 import re
+import threading
 import customtkinter as ctk
+from concurrent.futures import ThreadPoolExecutor
+import ValFunc as vf # kept light: requests etc. are imported on first use
+from ChapterTemplate import FORMATS
+# import ImgageOpenURL
+import Metrics
 
 
 class ChapterPrinter(ctk.CTk):
     """Window of program"""
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, exitAfterPaint=False, **kwargs):
         ctk.CTk.__init__(self, *args, **kwargs)
         self.title("Chapter Printer")
-        self.geometry("400x240+100+100")
+        self.geometry("400x300+100+100")
         
         self.puuid: str = ''
-        self.matchStats: vf.PlayerMatchStats | None = None
+        self.matchStats: vf.PlayerMatchStats | vf.MultiMatchStats | None = None
         self.startTime: int = 60
+        self.tasks = BackgroundTasks(self)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.startupSec: float | None = None
+        self.exitAfterPaint: bool = exitAfterPaint
 
+        self.container = ctk.CTkFrame(self)
+        self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
 
-        container = ctk.CTkFrame(self)
-        container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
+        self.pages = {F.__name__: F for F in (GTEntryPage, MatchEntryPage, RecentMatchesPage, ChaptersPage)} # add more pages here
+        self.frames = {} # pages are only built when first shown
 
-        self.frames = {}
-        for F in (GTEntryPage, MatchEntryPage, ChaptersPage): # add more pages here
-            page_name = F.__name__
-            frame = F(parent=container, controller=self)
-            self.frames[page_name] = frame
+        self.show_frame("GTEntryPage") # top page
+        self.after(0, self.after_idle, self._on_first_paint) # once the window is mapped and drawn
 
+    def get_frame(self, page_name):
+        '''Returns the page with the given name, building it on first use'''
+        frame = self.frames.get(page_name)
+        if frame is None:
+            frame = self.pages[page_name](parent=self.container, controller=self)
             frame.grid(row=0, column=0, sticky="nsew")
-
-        self.show_frame("GTEntryPage") # top page
+            self.frames[page_name] = frame
+        return frame
 
     def show_frame(self, page_name):
         '''Show a frame for the given page name'''
-        frame = self.frames[page_name]
+        frame = self.get_frame(page_name)
         frame.tkraise()
     
+    def _on_first_paint(self):
+        self.startupSec = time.perf_counter() - _startTime
+        Metrics.record('gui.first_paint', self.startupSec)
+        if self.exitAfterPaint:
+            print(f"First paint after {self.startupSec * 1e3:.0f} ms")
+            self._on_close()
+            return
+        self.tasks.executor.submit(vf.warm_up) # connection and identity cache, while the user types
+    
     def copy_to_clip(self, field):
         '''Copy the given field value to the clipboard'''
         self.clipboard_clear()
         self.clipboard_append(field.get("1.0", ctk.END).rstrip())
+    
+    def _on_close(self):
+        self.tasks.shutdown()
+        self.destroy()
+
+
+class BackgroundTask:
+    """A network call running off the Tk main loop"""
+    def __init__(self, key, future, onDone, onError):
+        self.key = key
+        self.future = future
+        self.onDone = onDone
+        self.onError = onError
+        self.cancelled: bool = False
+
+
+class BackgroundTasks:
+    """Runs blocking calls on worker threads and hands results back to the Tk loop.
+
+    Results are collected by polling with after(), so callbacks always run on
+    the main thread. Submitting a key that is already in flight returns the
+    existing task instead of starting a duplicate request.
+    """
+    POLL_MS = 50
+
+    def __init__(self, root, maxWorkers=4, maxStreams=4):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="gui-task")
+        # long-running result streams (recent matches), kept apart so they can't hold up lookups
+        self.streamExecutor = ThreadPoolExecutor(max_workers=maxStreams, thread_name_prefix="gui-stream")
+        self.inFlight: dict = {}
+
+    def submit(self, key, func, args, onDone, onError):
+        '''Runs func(*args) in the background, then onDone(result) or onError(exception) on the Tk loop'''
+        if key in self.inFlight:
+            return self.inFlight[key]
+        task = BackgroundTask(key, self.executor.submit(func, *args), onDone, onError)
+        self.inFlight[key] = task
+        self.root.after(self.POLL_MS, self._poll, task)
+        return task
+
+    def cancel(self, task):
+        '''Drops the task's result; a request already on the wire still finishes in its thread'''
+        if task is None or task.cancelled:
+            return
+        task.cancelled = True
+        task.future.cancel()
+        if self.inFlight.get(task.key) is task:
+            del self.inFlight[task.key]
+
+    def _poll(self, task):
+        if task.cancelled:
+            return
+        if not task.future.done():
+            self.root.after(self.POLL_MS, self._poll, task)
+            return
+        del self.inFlight[task.key]
+        try:
+            result = task.future.result()
+        except Exception as e:
+            task.onError(e)
+        else:
+            task.onDone(result)
+
+    def shutdown(self):
+        for task in list(self.inFlight.values()):
+            self.cancel(task)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.streamExecutor.shutdown(wait=False, cancel_futures=True)
+
+
+class LoadingBar(ctk.CTkProgressBar):
+    """Indeterminate progress bar that is hidden while idle"""
+    def __init__(self, parent, **kwargs):
+        ctk.CTkProgressBar.__init__(self, parent, mode="indeterminate", width=200, **kwargs)
+
+    def show(self):
+        self.grid()
+        self.start()
+
+    def hide(self):
+        self.stop()
+        self.grid_remove()
 
 
 class GTEntryPage(ctk.CTkFrame):
@@ -49,6 +157,7 @@ class GTEntryPage(ctk.CTkFrame):
         self.controller = controller
         
         self.riotID: str | None = None
+        self.task: BackgroundTask | None = None
         
         rIDlabel = ctk.CTkLabel(self, text="Riot ID:")
         rIDlabel.grid(row=1, column=1, pady=10, padx=5)
@@ -57,28 +166,61 @@ class GTEntryPage(ctk.CTkFrame):
         self.rIDentry.grid(row=1, column=2, pady=10)
         self.rIDentry.bind("<Return>", self._check_RiotID)
         
-        buttonEnter = ctk.CTkButton(self, text="Enter", command=self._check_RiotID)
-        buttonEnter.grid(row=2, column=1, columnspan=2)
+        self.buttonEnter = ctk.CTkButton(self, text="Enter", command=self._check_RiotID)
+        self.buttonEnter.grid(row=2, column=1, columnspan=2)
         
         self.warningStr = ctk.StringVar()
         warningLable = ctk.CTkLabel(self, textvariable=self.warningStr, width=35, height=0, wraplength=200)
         warningLable.grid(row=3, column=1, columnspan=2, pady=10)
         
+        self.loadingBar = LoadingBar(self)
+        self.loadingBar.grid(row=4, column=1, columnspan=2)
+        self.loadingBar.hide()
+        
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(3, weight=1)
     
     def _check_RiotID(self, e=None):
-        if not self.rIDentry.get(): # if empty
+        riotID = self.rIDentry.get().rstrip()
+        if not riotID: # if empty
             self.warningStr.set("Please enter Riot ID")
             return
-        elif self.riotID != self.rIDentry.get().rstrip():
+        elif self.riotID != riotID:
             try:
-                username, tagline = vf.str_to_user_gt(self.rIDentry.get())
-                self.controller.puuid = vf.gt_to_puuid(username, tagline)
-                self.riotID = self.rIDentry.get().rstrip()
-            except Exception as e:
+                username, tagline = vf.str_to_user_gt(riotID)
+            except ValueError as e:
                 self.warningStr.set(e)
                 return
+            if self.task is not None and self.task.key != ("puuid", riotID):
+                self.controller.tasks.cancel(self.task) # entry changed while loading
+            self.task = self.controller.tasks.submit(
+                ("puuid", riotID), vf.gt_to_puuid, (username, tagline),
+                lambda puuid: self._on_puuid(riotID, puuid), self._on_error
+            )
+            self._set_loading(True)
+            return
+        self._next_page()
+    
+    def _on_puuid(self, riotID, puuid):
+        self._set_loading(False)
+        self.controller.puuid = puuid
+        self.riotID = riotID
+        self._next_page()
+    
+    def _on_error(self, e):
+        self._set_loading(False)
+        self.warningStr.set(e)
+    
+    def _set_loading(self, loading):
+        if loading:
+            self.warningStr.set("Looking up Riot ID...")
+            self.loadingBar.show()
+        else:
+            self.task = None
+            self.warningStr.set("")
+            self.loadingBar.hide()
+    
+    def _next_page(self):
         self.controller.show_frame("MatchEntryPage")
         self.warningStr.set("")
     
@@ -90,8 +232,10 @@ class MatchEntryPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
         ctk.CTkFrame.__init__(self, parent)
         self.controller = controller
+        self.task: BackgroundTask | None = None
+        self.startTime: int = 60 # seconds, from the latest valid entry
         
-        mIDlabel = ctk.CTkLabel(self, text="Match ID:")
+        mIDlabel = ctk.CTkLabel(self, text="Match ID(s):")
         mIDlabel.grid(row=1, column=1, pady=10)
         
         self.mIDentry = ctk.CTkEntry(self, placeholder_text="00000000-0000-0000-0000-000000000000")
@@ -105,58 +249,87 @@ class MatchEntryPage(ctk.CTkFrame):
         self.timeEntry.grid(row=2, column=2, pady=(0, 10))
         self.timeEntry.bind("<Return>", self._lookup_match)
         
-        buttonBack = ctk.CTkButton(self, text="Go back", command=lambda: self.controller.show_frame("GTEntryPage"))
+        buttonBack = ctk.CTkButton(self, text="Go back", command=self._go_back)
         buttonBack.grid(row=3, column=1, padx=(0, 5))
         
         buttonEnter = ctk.CTkButton(self, text="Enter", command=self._lookup_match)
         buttonEnter.grid(row=3, column=2)
         
+        buttonRecent = ctk.CTkButton(self, text="Recent matches", command=self._show_recent)
+        buttonRecent.grid(row=4, column=1, columnspan=2, pady=(10, 0))
+        
         self.warningStr = ctk.StringVar()
         warningLable = ctk.CTkLabel(self, textvariable=self.warningStr, width=37, height=0, wraplength=220)
-        warningLable.grid(row=4, column=1, columnspan=2, pady=10)
+        warningLable.grid(row=5, column=1, columnspan=2, pady=10)
+        
+        self.loadingBar = LoadingBar(self)
+        self.loadingBar.grid(row=6, column=1, columnspan=2)
+        self.loadingBar.hide()
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(3, weight=1)
     
     def _lookup_match(self, e=None):
-        if not self.mIDentry.get(): # if empty
+        if not self.mIDentry.get().strip(): # if empty
             self.warningStr.set("Please enter Match ID")
             return
-        matchID = self.mIDentry.get().rstrip()
-        if not self._verify_match_id_format(matchID):
+        matchIDs = self.mIDentry.get().replace(',', ' ').split() # several for a VOD of consecutive matches
+        if not all(self._verify_match_id_format(matchID) for matchID in matchIDs):
             self.warningStr.set("Invalid match ID format")
             return
         
-        if not self.timeEntry.get(): # if empty
-            self.controller.startTime = 60
-        else:
-            time = self.timeEntry.get().rstrip().split(':')
-            for part in time:
-                if not part.isnumeric():
-                    self.warningStr.set("Invalid time format: non-numeric input")
-                    return
-                if int(part) < 0:
-                    self.warningStr.set("Invalid time format: negative input")
-                    return
-            if len(time) == 3:
-                self.controller.startTime = int(time[0]) * 3600 + int(time[1]) * 60 + int(time[2])
-            elif len(time) == 2:
-                self.controller.startTime = int(time[0]) * 60 + int(time[1])
-            elif len(time) == 1:
-                self.controller.startTime = int(time[0])
-            else:
-                self.warningStr.set("Invalid time format: incorrect segments")
-                return
         try:
-            tempMatchStats = vf.PlayerMatchStats(matchID, self.controller.puuid)
-        except Exception as e:
+            self.startTime = self.get_start_time() # read again when the stats arrive, in case Enter re-joined a pending lookup
+        except ValueError as e:
             self.warningStr.set(e)
             return
-        self.controller.matchStats = tempMatchStats
-        self.controller.frames["ChaptersPage"].update_text()
+        key = ("match", tuple(matchIDs), self.controller.puuid)
+        if self.task is not None and self.task.key != key:
+            self.controller.tasks.cancel(self.task) # entry changed while loading
+        if len(matchIDs) == 1:
+            func, args = vf.PlayerMatchStats, (matchIDs[0], self.controller.puuid)
+        else: # placed on one timeline from the first match's start time
+            func, args = vf.MultiMatchStats, (matchIDs, self.controller.puuid)
+        self.task = self.controller.tasks.submit(
+            key, func, args,
+            self._on_match, self._on_error
+        )
+        self.warningStr.set("Loading match..." if len(matchIDs) == 1 else f"Loading {len(matchIDs)} matches...")
+        self.loadingBar.show()
+    
+    def _on_match(self, matchStats):
+        self._stop_loading()
+        self.controller.matchStats = matchStats
+        self.controller.startTime = self.startTime
+        self.controller.get_frame("ChaptersPage").update_text()
         self.controller.show_frame("ChaptersPage")
         self.warningStr.set("")
     
+    def _on_error(self, e):
+        self._stop_loading()
+        self.warningStr.set(e)
+    
+    def _stop_loading(self):
+        self.task = None
+        self.loadingBar.hide()
+    
+    def _go_back(self):
+        self.controller.tasks.cancel(self.task)
+        self._stop_loading()
+        self.warningStr.set("")
+        self.controller.show_frame("GTEntryPage")
+    
+    def _show_recent(self):
+        self.warningStr.set("")
+        self.controller.get_frame("RecentMatchesPage").load()
+        self.controller.show_frame("RecentMatchesPage")
+    
+    def get_start_time(self):
+        '''Returns the entered start time in seconds (60 if empty), raising ValueError if invalid'''
+        if not self.timeEntry.get(): # if empty
+            return 60
+        return vf.str_to_sec(self.timeEntry.get())
+    
     def _verify_match_id_format(self, match_id):
         pattern = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
         return pattern.match(match_id) is not None
@@ -166,6 +339,197 @@ class MatchEntryPage(ctk.CTkFrame):
         self.mIDentry.delete(0, ctk.END)
         self.timeEntry.delete(0, ctk.END)
 
+class MatchRow(ctk.CTkFrame):
+    """One row of the recent matches list, filled in once its match has loaded"""
+    def __init__(self, parent, matchID, onOpen):
+        ctk.CTkFrame.__init__(self, parent)
+        self.matchID = matchID
+        self.onOpen = onOpen
+        self.stats: vf.PlayerMatchStats | None = None
+        
+        self.infoStr = ctk.StringVar(value="Loading...")
+        infoLabel = ctk.CTkLabel(self, textvariable=self.infoStr, anchor="w", width=250)
+        infoLabel.grid(row=0, column=0, padx=5)
+        
+        self.buttonOpen = ctk.CTkButton(self, text="Chapters", width=70, state="disabled", command=lambda: self.onOpen(self.stats))
+        self.buttonOpen.grid(row=0, column=1, padx=5, pady=2)
+    
+    def fill(self, result):
+        '''Shows a vf.MatchResult: map, agent, score, KDA and ACS, or the error'''
+        if result.error is not None:
+            self.infoStr.set(f"Error: {result.error}")
+            return
+        self.stats = result.stats
+        player = result.stats.playerStats
+        wins = sum(curRound.win for curRound in result.stats.rounds)
+        losses = len(result.stats.rounds) - wins
+        self.infoStr.set(f"{result.stats.map} {player.agent} {wins}-{losses} | {player.kills}/{player.deaths}/{player.assists} | {player.acs} ACS")
+        self.buttonOpen.configure(state="normal")
+
+
+class RecentMatchesPage(ctk.CTkFrame):
+    """The player's recent matches, with rows filled in as each match loads.
+
+    Matches are fetched in a background stream that hands results to the Tk
+    loop through a queue. Once a page is requested, the next page is
+    prefetched at background priority.
+    """
+    PAGE_SIZE = 5
+    POLL_MS = 50
+
+    def __init__(self, parent, controller):
+        ctk.CTkFrame.__init__(self, parent)
+        self.controller = controller
+        
+        self.puuid: str | None = None # player the history belongs to
+        self.matchIDs: list[str] = []
+        self.results: dict[str, vf.MatchResult] = {}
+        self.inFlight: set[str] = set()
+        self.rows: dict[str, MatchRow] = {}
+        self.page: int = 0
+        self.listTask: BackgroundTask | None = None
+        self.cancelEvents: list[threading.Event] = []
+        self.resultQueue: queue.Queue = queue.Queue()
+        self.polling: bool = False
+        
+        buttonBack = ctk.CTkButton(self, text="Go back", width=80, command=self._go_back)
+        buttonBack.grid(row=0, column=1, pady=10, padx=5)
+        
+        self.buttonPrev = ctk.CTkButton(self, text="<", width=40, state="disabled", command=lambda: self._show_page(self.page - 1))
+        self.buttonPrev.grid(row=0, column=2, pady=10, padx=5)
+        
+        self.buttonNext = ctk.CTkButton(self, text=">", width=40, state="disabled", command=lambda: self._show_page(self.page + 1))
+        self.buttonNext.grid(row=0, column=3, pady=10, padx=5)
+        
+        self.statusStr = ctk.StringVar()
+        statusLabel = ctk.CTkLabel(self, textvariable=self.statusStr, width=100, wraplength=150)
+        statusLabel.grid(row=0, column=4, pady=10)
+        
+        self.rowFrame = ctk.CTkScrollableFrame(self, width=350, height=180)
+        self.rowFrame.grid(row=1, column=1, columnspan=4)
+        
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(5, weight=1)
+    
+    def load(self):
+        '''Loads the current player's match history, unless it is already loaded'''
+        if self.puuid == self.controller.puuid and self.matchIDs:
+            self._show_page(self.page)
+            return
+        self._reset()
+        self.puuid = self.controller.puuid
+        self.statusStr.set("Loading history...")
+        self.listTask = self.controller.tasks.submit(
+            ("history", self.puuid), vf.list_last_matches, (self.puuid,), self._on_history, self._on_error
+        )
+    
+    def _reset(self):
+        self.controller.tasks.cancel(self.listTask)
+        self.listTask = None
+        for cancelEvent in self.cancelEvents:
+            cancelEvent.set()
+        self.cancelEvents = []
+        self.matchIDs = []
+        self.results = {}
+        self.inFlight = set()
+        self.page = 0
+        self._clear_rows()
+    
+    def _on_history(self, matchIDs):
+        self.listTask = None
+        self.matchIDs = matchIDs
+        if not matchIDs:
+            self.statusStr.set("No recent matches")
+            return
+        self._show_page(0)
+    
+    def _on_error(self, e):
+        self.listTask = None
+        self.statusStr.set(f"{e}")
+    
+    def _page_ids(self, page):
+        return self.matchIDs[page * self.PAGE_SIZE:(page + 1) * self.PAGE_SIZE]
+    
+    def _clear_rows(self):
+        for row in self.rows.values():
+            row.destroy()
+        self.rows = {}
+    
+    def _show_page(self, page):
+        self.page = page
+        self._clear_rows()
+        for i, matchID in enumerate(self._page_ids(page)):
+            row = MatchRow(self.rowFrame, matchID, self._open)
+            row.grid(row=i, column=0, sticky="ew", pady=2)
+            self.rows[matchID] = row
+            if matchID in self.results:
+                row.fill(self.results[matchID])
+        self._stream(self._page_ids(page), vf.PRIORITY_INTERACTIVE)
+        self._stream(self._page_ids(page + 1), vf.PRIORITY_BACKGROUND) # prefetch while the user reads
+        numPages = (len(self.matchIDs) + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+        self.buttonPrev.configure(state="normal" if page > 0 else "disabled")
+        self.buttonNext.configure(state="normal" if page + 1 < numPages else "disabled")
+        self.statusStr.set(f"Page {page + 1}/{numPages}")
+    
+    def _stream(self, matchIDs, priority):
+        matchIDs = [matchID for matchID in matchIDs if matchID not in self.results and matchID not in self.inFlight]
+        if not matchIDs:
+            return
+        self.inFlight.update(matchIDs)
+        cancelEvent = threading.Event()
+        self.cancelEvents.append(cancelEvent)
+        self.controller.tasks.streamExecutor.submit(self._stream_worker, matchIDs, self.puuid, priority, cancelEvent)
+        if not self.polling:
+            self.polling = True
+            self.after(self.POLL_MS, self._poll)
+    
+    def _stream_worker(self, matchIDs, puuid, priority, cancelEvent):
+        '''Runs on a worker thread: queues each MatchResult as soon as it is parsed'''
+        results = vf.fetch_matches(matchIDs, puuid, priority=priority)
+        try:
+            for result in results:
+                if cancelEvent.is_set():
+                    break
+                self.resultQueue.put((puuid, result))
+        except Exception as e: # never leave rows stuck on "Loading..."
+            for matchID in matchIDs:
+                self.resultQueue.put((puuid, vf.MatchResult(matchID, None, e)))
+        finally:
+            results.close()
+    
+    def _poll(self):
+        while True:
+            try:
+                puuid, result = self.resultQueue.get_nowait()
+            except queue.Empty:
+                break
+            if puuid != self.puuid:
+                continue # from a player we've since moved away from
+            self.results[result.match_id] = result
+            self.inFlight.discard(result.match_id)
+            if result.match_id in self.rows:
+                self.rows[result.match_id].fill(result)
+        if self.inFlight:
+            self.after(self.POLL_MS, self._poll)
+        else:
+            self.polling = False
+    
+    def _open(self, stats):
+        try:
+            startTime = self.controller.get_frame("MatchEntryPage").get_start_time()
+        except ValueError:
+            startTime = 60
+        self.controller.matchStats = stats
+        self.controller.startTime = startTime
+        self.controller.get_frame("ChaptersPage").update_text()
+        self.controller.show_frame("ChaptersPage")
+    
+    def _go_back(self):
+        self.controller.tasks.cancel(self.listTask)
+        self.listTask = None
+        self.controller.show_frame("MatchEntryPage")
+
+
 class ChaptersPage(ctk.CTkFrame):
     """Chapters page to copy chapters to clipboard"""
     def __init__(self, parent, controller):
@@ -178,27 +542,34 @@ class ChaptersPage(ctk.CTkFrame):
         buttonBack = ctk.CTkButton(self, text="New match", command=self._go_back)
         buttonBack.grid(row=1, column=2, pady=10)
         
+        self.formatStr = ctk.StringVar(value="youtube")
+        formatMenu = ctk.CTkOptionMenu(self, values=list(FORMATS), variable=self.formatStr, width=90, command=lambda _: self.update_text())
+        formatMenu.grid(row=1, column=3, pady=10, padx=(5, 0))
+        
         self.textChapters = ctk.CTkTextbox(self, width=300, height=180, state="disabled")
-        self.textChapters.grid(row=2, column=1, columnspan=2)
+        self.textChapters.grid(row=2, column=1, columnspan=3)
         
         self.grid_columnconfigure(0, weight=1)
-        self.grid_columnconfigure(3, weight=1)
+        self.grid_columnconfigure(4, weight=1)
 
     def update_text(self):
         '''Updates the text in the textChapters widget with the chapters obtained from the matchStats object'''
-        chapter_text = self.controller.matchStats.get_chapters(self.controller.startTime)
+        chapter_text = self.controller.matchStats.get_chapters(self.controller.startTime, template=self.formatStr.get())
         self.textChapters.configure(state="normal")
         self.textChapters.delete("1.0", ctk.END)
         self.textChapters.insert(ctk.END, chapter_text)
         self.textChapters.configure(state="disabled")
     
     def _go_back(self, e=None):
-        self.controller.frames["MatchEntryPage"].clear_entries()
+        self.controller.get_frame("MatchEntryPage").clear_entries()
         self.controller.show_frame("MatchEntryPage")
 
 
 
 if __name__ == "__main__":
-    win = ChapterPrinter()
+    parser = argparse.ArgumentParser(description="Chapter Printer for Valorant VODs.")
+    parser.add_argument("--startup-time", action="store_true", help="print the time to first paint and exit")
+    args = parser.parse_args()
+    win = ChapterPrinter(exitAfterPaint=args.startup_time)
     win.mainloop()
 